@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import os
+from collections import OrderedDict
 from typing import Any
 
 from aqt import mw
@@ -61,6 +62,9 @@ MASS_LINKER_RULES: dict[str, Any] = {}
 STABILITY_DEFAULT_THRESHOLD = 14.0
 STABILITY_AGG = "min"
 
+_DEP_TREE_CACHE_MAX = 16
+_DEP_TREE_CACHE: "OrderedDict[tuple[Any, ...], dict[str, Any]]" = OrderedDict()
+
 
 def _load_config() -> dict[str, Any]:
     if not os.path.exists(CONFIG_PATH):
@@ -421,6 +425,44 @@ def _resolve_dep_tree_nid(
     return 0
 
 
+def _copy_dep_tree_payload(payload: dict[str, Any]) -> dict[str, Any]:
+    return {
+        **payload,
+        "nodes": [dict(n) for n in (payload.get("nodes") or [])],
+        "edges": [dict(e) for e in (payload.get("edges") or [])],
+    }
+
+
+def _dep_tree_payload(
+    bg: Any,
+    target_nid: int,
+    chain_key: tuple[Any, ...] | None,
+    chain_nodes: set[int],
+    chain_edges: list[tuple[int, int]],
+    chain_labels: dict[int, str],
+) -> dict[str, Any]:
+    # Dependent add-ons poll the same note repeatedly. The chain's own memo key covers its nodes,
+    # edges and labels; note-type CSS (accent colors) is stamped separately.
+    key = None
+    if chain_key is not None:
+        key = (chain_key, bg._notetypes_mtime())  # noqa: SLF001 - shared internal data builder
+        hit = _DEP_TREE_CACHE.get(key)
+        if hit is not None:
+            _DEP_TREE_CACHE.move_to_end(key)
+            return _copy_dep_tree_payload(hit)
+    payload = bg._build_prio_chain_payload(  # noqa: SLF001 - shared internal data builder
+        int(target_nid),
+        chain_nodes,
+        chain_edges,
+        chain_labels,
+    )
+    if key is not None:
+        _DEP_TREE_CACHE[key] = _copy_dep_tree_payload(payload)
+        while len(_DEP_TREE_CACHE) > _DEP_TREE_CACHE_MAX:
+            _DEP_TREE_CACHE.popitem(last=False)
+    return payload
+
+
 def get_dependency_tree(
     nid: int | None = None,
     *,
@@ -439,17 +481,12 @@ def get_dependency_tree(
         return {"nodes": [], "edges": [], "current_nid": int(target_nid)}
 
     try:
-        chain_nodes, chain_edges, chain_labels = _bg._family_prio_chain(int(target_nid))  # noqa: SLF001 - shared internal data builder
+        chain_key, chain_nodes, chain_edges, chain_labels = _bg._family_prio_chain_keyed(int(target_nid))  # noqa: SLF001 - shared internal data builder
     except Exception:
         return {"nodes": [], "edges": [], "current_nid": int(target_nid)}
 
     try:
-        payload = _bg._build_prio_chain_payload(  # noqa: SLF001 - shared internal data builder
-            int(target_nid),
-            chain_nodes,
-            chain_edges,
-            chain_labels,
-        )
+        payload = _dep_tree_payload(_bg, int(target_nid), chain_key, chain_nodes, chain_edges, chain_labels)
     except Exception:
         payload = {"nodes": [], "edges": [], "current_nid": int(target_nid)}
 
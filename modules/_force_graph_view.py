@@ -669,6 +669,18 @@ html, body {
 """
 
 
+def _encode_payload(payload: dict[str, Any] | str | None) -> str:
+    # JS string literal holding the payload JSON, ready for JSON.parse(...).
+    if isinstance(payload, str):
+        data = payload or "{}"
+    else:
+        try:
+            data = json.dumps(payload or {"nodes": [], "edges": []}, ensure_ascii=False)
+        except Exception:
+            data = "{}"
+    return json.dumps(data, ensure_ascii=True)
+
+
 class ForceGraphView(QWidget):
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
@@ -676,6 +688,7 @@ class ForceGraphView(QWidget):
         self._on_select: Callable[[int], None] | None = None
         self._ready = False
         self._pending: dict[str, Any] = {"nodes": [], "edges": []}
+        self._pending_js = _encode_payload(self._pending)
         self.setMinimumHeight(160)
         self._view = AnkiWebView(parent=self, title="ajpc_force_graph")
         self._view.set_bridge_command(self._on_bridge, self)
@@ -699,8 +712,13 @@ class ForceGraphView(QWidget):
     def set_select_handler(self, callback: Callable[[int], None] | None) -> None:
         self._on_select = callback
 
-    def set_data(self, payload: dict[str, Any]) -> None:
-        self._pending = payload or {"nodes": [], "edges": []}
+    def set_data(self, payload: dict[str, Any] | str) -> None:
+        # A str payload is already-encoded JSON; either way it is encoded once, not per push.
+        data_js = _encode_payload(payload)
+        if data_js == self._pending_js:
+            return
+        self._pending = payload if isinstance(payload, dict) else {}
+        self._pending_js = data_js
         self._push_payload()
 
     def set_background(self, color: str) -> None:
@@ -755,14 +773,9 @@ class ForceGraphView(QWidget):
         )
 
     def _push_payload(self) -> None:
-        try:
-            data = json.dumps(self._pending or {}, ensure_ascii=False)
-            data_js_str = json.dumps(data, ensure_ascii=True)
-        except Exception:
-            data_js_str = json.dumps("{}", ensure_ascii=True)
         self._view.eval(
             "window.__AJPC_FORCE_DATA = JSON.parse("
-            + data_js_str
+            + self._pending_js
             + ");"
             "if (window.AJPCForceGraph) { "
             "window.AJPCForceGraph.setData(window.__AJPC_FORCE_DATA); }"
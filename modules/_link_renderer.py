@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import re
-from typing import Any
+from typing import Iterator
 
-_LINK_RE = re.compile(r"\[((?:[^\[]|\\\[)*?)\|(nid|cid)(\d+)\]", re.IGNORECASE)
-_RAW_LINK_TARGET_RE = re.compile(r"\[[^\]]*?\|(nid|cid)(\d+)\]", re.IGNORECASE)
-_AJPC_CMD_TARGET_RE = re.compile(
-    r"AJPCNoteLinker-open(?:Preview|Editor)[^0-9]*([0-9]+)",
+# "nidN]" / "cidN]" right after the "|" of a [label|nidN] link.
+_LINK_TAIL_RE = re.compile(r"(nid|cid)(\d+)\]", re.IGNORECASE)
+# Raw [label|nidN] / [label|cidN] links (groups 1, 2) or AJPC command targets (group 3), in one scan.
+_LINK_TARGET_RE = re.compile(
+    r"\[[^\]]*?\|(nid|cid)(\d+)\]|AJPCNoteLinker-open(?:Preview|Editor)[^0-9]*([0-9]+)",
     re.IGNORECASE,
 )
+# Literal part of the command target, for the no-"[" prefilter; searched in place, no lowercased copy.
+_CMD_HINT_RE = re.compile(r"notelinker-open", re.IGNORECASE)
 
 
 def existing_link_targets(html: str) -> tuple[set[int], set[int]]:
@@ -17,39 +20,86 @@ def existing_link_targets(html: str) -> tuple[set[int], set[int]]:
 
     if not html:
         return nids, cids
+    # Plain fields hold neither a "[" nor a command URL; both checks are cheaper than the full scan.
+    if "[" not in html and _CMD_HINT_RE.search(html) is None:
+        return nids, cids
 
-    for m in _RAW_LINK_TARGET_RE.finditer(html):
-        kind = (m.group(1) or "").lower()
-        try:
-            val = int(m.group(2))
-        except Exception:
-            continue
-        if kind == "cid":
-            cids.add(val)
+    # findall hands back plain group tuples, so no Match object is built per hit.
+    hits = _LINK_TARGET_RE.findall(html)
+    if not hits:
+        return nids, cids
+    add_nid = nids.add
+    add_cid = cids.add
+    for kind, num, cmd in hits:
+        if cmd:
+            add_nid(int(cmd))
+        elif kind.lower() == "cid":
+            add_cid(int(num))
         else:
-            nids.add(val)
-
-    for m in _AJPC_CMD_TARGET_RE.finditer(html):
-        try:
-            nids.add(int(m.group(1)))
-        except Exception:
-            continue
+            add_nid(int(num))
 
     return nids, cids
 
 
+_NOTE_LINK_HEAD = '<a class="ajpc-note-link" href=\'javascript:pycmd("AJPCNoteLinker-openPreview"+"'
+_NOTE_LINK_MID = '")\' oncontextmenu=\'event.preventDefault();pycmd("AJPCNoteLinker-openEditor"+"'
+_NOTE_LINK_TEXT = '")\'><div class="ajpc-note-link-text">'
+_NOTE_LINK_TAIL = "</div></a>"
+
+
+def iter_raw_links(html: str) -> Iterator[tuple[int, int, str, str, str]]:
+    # (start, end, label, kind, digits) for every [label|nidN] / [label|cidN], left to right.
+    # Same matches as r"\[((?:[^\[]|\\\[)*?)\|(nid|cid)(\d+)\]" with re.I, driven by str.find:
+    # a label may hold "[" only as "\[", and the first "|nidN]" / "|cidN]" closes it.
+    k = html.find("[")
+    while k >= 0:
+        # An unescaped "[" before the closing "|" ends the attempt at k; the next one starts there.
+        m = None
+        u = -1
+        lo = k + 1
+        j = html.find("|", lo)
+        while j >= 0:
+            u = html.find("[", lo, j)
+            while u > 0 and html[u - 1] == "\\":
+                u = html.find("[", u + 1, j)
+            if u >= 0:
+                break
+            m = _LINK_TAIL_RE.match(html, j + 1)
+            if m is not None:
+                break
+            lo = j
+            j = html.find("|", j + 1)
+        if m is None:
+            if j < 0:
+                return
+            k = u
+            continue
+        label = html[k + 1 : j]
+        if "\\[" in label:
+            label = label.replace("\\[", "[")
+        kind = m.group(1)
+        if kind != "nid" and kind != "cid":
+            kind = kind.lower()
+        end = m.end()
+        yield k, end, label, kind, m.group(2)
+        k = html.find("[", end)
+
+
 def convert_links(html: str) -> tuple[str, int]:
-    def repl(match: Any) -> str:
-        label = match.group(1).replace("\\[", "[")
-        kind = str(match.group(2) or "").lower()
-        target = str(match.group(3) or "")
+    if "[" not in html:
+        return html, 0
+    out: list[str] = []
+    append = out.append
+    count = 0
+    pos = 0
+    for start, end, label, kind, target in iter_raw_links(html):
+        count += 1
         if kind != "nid":
-            return match.group(0)
-        return (
-            f'<a class="ajpc-note-link" '
-            f'href=\'javascript:pycmd("AJPCNoteLinker-openPreview"+"{target}")\' '
-            f'oncontextmenu=\'event.preventDefault();pycmd("AJPCNoteLinker-openEditor"+"{target}")\'>'  # noqa: E501
-            f'<div class="ajpc-note-link-text">{label}</div></a>'
-        )
-
-    return _LINK_RE.subn(repl, html)
+            continue
+        append(html[pos:start])
+        append(_NOTE_LINK_HEAD + target + _NOTE_LINK_MID + target + _NOTE_LINK_TEXT + label + _NOTE_LINK_TAIL)
+        pos = end
+    if not out:
+        return html, count
+    append(html[pos:])
+    return "".join(out), count
@@ -12,14 +12,21 @@ from aqt.qt import QDialogButtonBox, QMainWindow, QSplitter, Qt, QTimer
 
 ADDON_DIR = os.path.dirname(os.path.dirname(__file__))
 CONFIG_PATH = os.path.join(ADDON_DIR, "config.json")
+_LAYOUT_CACHE: dict[str, tuple[float, tuple[int, int, float]]] = {}
 
 
 def _load_popup_editor_layout_settings() -> tuple[int, int, float]:
     width = 820
     height = 820
     sidebar_ratio = 0.30
-    if not os.path.exists(CONFIG_PATH):
+    try:
+        mtime = os.stat(CONFIG_PATH).st_mtime
+    except OSError:
         return (width, height, sidebar_ratio)
+    # Re-parse only when config.json was written since the last editor window opened.
+    cached = _LAYOUT_CACHE.get(CONFIG_PATH)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
     try:
         with open(CONFIG_PATH, "r", encoding="utf-8-sig") as f:
             cfg = json.load(f)
@@ -43,7 +50,9 @@ def _load_popup_editor_layout_settings() -> tuple[int, int, float]:
     width = max(640, min(3840, int(width)))
     height = max(480, min(2160, int(height)))
     sidebar_ratio = max(0.10, min(0.60, float(sidebar_ratio)))
-    return (width, height, sidebar_ratio)
+    out = (width, height, sidebar_ratio)
+    _LAYOUT_CACHE[CONFIG_PATH] = (mtime, out)
+    return out
 
 
 class _NoteEditorWindow(QMainWindow):
@@ -58,6 +67,7 @@ class _NoteEditorWindow(QMainWindow):
         self.card = None
         self._ajpc_browser_graph_panel = None
         self._ajpc_main_splitter = None
+        self._last_split_key: tuple[int, float, int, int] | None = None
         self.form = aqt.forms.editcurrent.Ui_Dialog()
         self.form.setupUi(self)
         self._init_link_panel()
@@ -93,6 +103,12 @@ class _NoteEditorWindow(QMainWindow):
 
         min_sidebar = int(max(0, panel.minimumWidth()))
         max_sidebar = int(panel.maximumWidth()) if int(panel.maximumWidth()) > 0 else total
+        # Queued at 0 ms and 60 ms after load; a repeat with the same geometry would only
+        # cascade another resize/reflow through the panel.
+        split_key = (total, ratio, min_sidebar, max_sidebar)
+        if split_key == self._last_split_key:
+            return True
+        self._last_split_key = split_key
         sidebar = int(round(total * ratio))
         sidebar = max(min_sidebar, min(max_sidebar, sidebar))
         if sidebar >= total:
@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 from typing import Any, Callable
 
-from aqt.qt import QColor, Qt, QVBoxLayout, QWidget
+from aqt.qt import QColor, Qt, QTimer, QVBoxLayout, QWidget
 from aqt.webview import AnkiWebView
 
 from ._note_editor import open_note_editor
@@ -20,24 +20,39 @@ html, body {
   background: transparent;
 }
 #ajpc-prio-root {
+  position: relative;
   width: 100%;
   height: 100%;
   overflow: hidden;
   background: transparent;
 }
-#ajpc-prio-canvas {
+#ajpc-prio-canvas,
+#ajpc-prio-fx {
+  position: absolute;
+  left: 0;
+  top: 0;
   width: 100%;
   height: 100%;
   display: block;
 }
+#ajpc-prio-fx {
+  pointer-events: none;
+}
 </style>
 <div id="ajpc-prio-root">
   <canvas id="ajpc-prio-canvas"></canvas>
+  <canvas id="ajpc-prio-fx"></canvas>
 </div>
 <script>
 (function () {
   const canvas = document.getElementById("ajpc-prio-canvas");
-  const ctx = canvas.getContext("2d");
+  const root = document.getElementById("ajpc-prio-root");
+  // The canvases stay transparent; the panel background is painted by the root element.
+  const ctxOptions = { alpha: true, desynchronized: true, willReadFrequently: false };
+  const ctx = canvas.getContext("2d", ctxOptions);
+  // Static graph on the base canvas; only the pulse and selection rings repaint per frame.
+  const fxCanvas = document.getElementById("ajpc-prio-fx");
+  const fxCtx = fxCanvas.getContext("2d", ctxOptions);
   const state = {
     nodes: [],
     edges: [],
@@ -51,41 +66,135 @@ html, body {
     pan: { active: false, sx: 0, sy: 0, ox: 0, oy: 0, moved: false },
     neededHeight: 0,
     lastNeededSent: -1,
+    neededPending: 0,
+    neededRaf: 0,
+    needsResize: false,
+    needsDraw: false,
+    frameRaf: 0,
+    onScreen: true,
+    largeGraph: false,
+    cssW: 0,
+    cssH: 0,
+    wrapCache: new Map(),
+    layoutVersion: 0,
+    renderCache: null,
+    baseKey: "",
+    pick: null,
+    scratch: {
+      preds: new Map(),
+      outs: new Map(),
+      depth: new Map(),
+      levels: new Map(),
+      orderByLevel: new Map(),
+      labelRank: new Map(),
+      nbrByDepth: new Map(),
+      rowLayouts: [],
+      pool: [],
+    },
+    nodePaths: null,
     ready: false,
   };
 
-  function postNeededHeight(value) {
-    const v = Math.max(0, Math.round(Number(value || 0)));
+  function flushNeededHeight() {
+    state.neededRaf = 0;
+    const v = state.neededPending;
     if (v === state.lastNeededSent) return;
     state.lastNeededSent = v;
     pycmd("AJPCPrioChain-neededHeight:" + String(v));
   }
 
+  function postNeededHeight(value) {
+    // A burst of layouts (build + resize) posts only the last height, once per frame.
+    state.neededPending = Math.max(0, Math.round(Number(value || 0)));
+    if (document.hidden) {
+      if (state.neededRaf) cancelAnimationFrame(state.neededRaf);
+      flushNeededHeight();
+      return;
+    }
+    if (!state.neededRaf) state.neededRaf = requestAnimationFrame(flushNeededHeight);
+  }
+
   function resize() {
-    const dpr = Math.max(1, window.devicePixelRatio || 1);
+    // The only place that reads DOM geometry; layout and draw use the cached CSS size.
+    state.cssW = canvas.clientWidth;
+    state.cssH = canvas.clientHeight;
     const rect = canvas.getBoundingClientRect();
     if (rect.width < 2 || rect.height < 2) return;
+    let dpr = Math.max(1, window.devicePixelRatio || 1);
+    state.largeGraph = state.nodes.length > 200;
+    if (state.largeGraph) {
+      // Large chains are fill-rate bound; cap the backing store at about 2M pixels per layer.
+      dpr = Math.min(dpr, Math.max(1, Math.sqrt(2000000 / (rect.width * rect.height))));
+    }
     canvas.width = Math.floor(rect.width * dpr);
     canvas.height = Math.floor(rect.height * dpr);
     ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+    fxCanvas.width = canvas.width;
+    fxCanvas.height = canvas.height;
+    fxCtx.setTransform(dpr, 0, 0, dpr, 0, 0);
+    state.baseKey = "";
+  }
+
+  const rectTemplates = new Map();
+
+  function rectTemplate(w, h, r) {
+    // Rounded-rect outline at the origin, shared by every box with the same size.
+    const key = w + "x" + h + "x" + r;
+    let path = rectTemplates.get(key);
+    if (!path) {
+      if (rectTemplates.size >= 512) rectTemplates.clear();
+      path = new Path2D();
+      roundRectPath(path, 0, 0, w, h, r);
+      rectTemplates.set(key, path);
+    }
+    return path;
+  }
+
+  function roundRect(c, x, y, w, h, r) {
+    c.beginPath();
+    roundRectPath(c, x, y, w, h, r);
+  }
+
+  function roundRectPath(c, x, y, w, h, r) {
+    const rr = Math.min(r, w * 0.5, h * 0.5);
+    c.moveTo(x + rr, y);
+    c.lineTo(x + w - rr, y);
+    c.quadraticCurveTo(x + w, y, x + w, y + rr);
+    c.lineTo(x + w, y + h - rr);
+    c.quadraticCurveTo(x + w, y + h, x + w - rr, y + h);
+    c.lineTo(x + rr, y + h);
+    c.quadraticCurveTo(x, y + h, x, y + h - rr);
+    c.lineTo(x, y + rr);
+    c.quadraticCurveTo(x, y, x + rr, y);
+    c.closePath();
   }
 
   function wrapText(text, maxW, maxLines) {
-    const chars = Array.from(String(text || "Node"));
+    const str = String(text || "Node");
+    if (ctx.measureText(str).width <= maxW) return [str];
+    // UTF-16 offset of every code point, so lines never split a surrogate pair.
+    const offs = [];
+    for (let i = 0; i < str.length; i++) {
+      offs.push(i);
+      if (str.codePointAt(i) > 0xffff) i++;
+    }
+    offs.push(str.length);
+    const count = offs.length - 1;
     const lines = [];
-    let cur = "";
-    for (const ch of chars) {
-      const next = cur + ch;
-      if (ctx.measureText(next).width <= maxW || cur.length === 0) {
-        cur = next;
-      } else {
-        lines.push(cur);
-        cur = ch;
-        if (lines.length >= maxLines) break;
+    let pos = 0;
+    while (pos < count && lines.length < maxLines) {
+      // Longest run of code points from pos that fits; at least one per line.
+      let lo = 1;
+      let hi = count - pos;
+      while (lo < hi) {
+        const mid = (lo + hi + 1) >> 1;
+        if (ctx.measureText(str.slice(offs[pos], offs[pos + mid])).width <= maxW) lo = mid;
+        else hi = mid - 1;
       }
+      lines.push(str.slice(offs[pos], offs[pos + lo]));
+      pos += lo;
     }
-    if (cur && lines.length < maxLines) lines.push(cur);
-    if (lines.length >= maxLines && chars.length > 0) {
+    if (lines.length >= maxLines) {
       lines[maxLines - 1] = lines[maxLines - 1].slice(0, Math.max(1, lines[maxLines - 1].length - 3)) + "...";
     }
     return lines.length ? lines : ["Node"];
@@ -98,21 +207,47 @@ html, body {
     state.currentNid = Number((payload && payload.current_nid) || 0);
     state.currentId = "";
 
-    const pNodes = (payload && payload.nodes) || [];
-    const pEdges = (payload && payload.edges) || [];
-    for (const n of pNodes) {
-      const id = String(n.id || "");
-      if (!id) continue;
-      const node = {
-        id,
-        nid: Number(n.nid || 0),
-        label: String(n.label || "Node"),
-        color: String(n.color || "#3d95e7"),
-        x: 0,
-        y: 0,
-      };
-      state.nodes.push(node);
-      state.byId.set(id, node);
+    if (payload && Array.isArray(payload.ids)) {
+      // Columnar payload from PrioChainView: fields are already typed and edges are
+      // index pairs into the node columns.
+      const ids = payload.ids;
+      const nids = payload.nids || [];
+      const labels = payload.labels || [];
+      const colors = payload.colors || [];
+      const byIndex = new Array(ids.length);
+      for (let i = 0; i < ids.length; i++) {
+        const node = { id: ids[i], nid: nids[i], label: labels[i], color: colors[i], x: 0, y: 0 };
+        byIndex[i] = node;
+        state.nodes.push(node);
+        state.byId.set(node.id, node);
+      }
+      const pairs = payload.edges || [];
+      for (let i = 0; i + 1 < pairs.length; i += 2) {
+        state.edges.push({ source: byIndex[pairs[i]], target: byIndex[pairs[i + 1]] });
+      }
+    } else {
+      const pNodes = (payload && payload.nodes) || [];
+      const pEdges = (payload && payload.edges) || [];
+      for (const n of pNodes) {
+        const id = String(n.id || "");
+        if (!id) continue;
+        const node = {
+          id,
+          nid: Number(n.nid || 0),
+          label: String(n.label || "Node"),
+          color: String(n.color || "#3d95e7"),
+          x: 0,
+          y: 0,
+        };
+        state.nodes.push(node);
+        state.byId.set(id, node);
+      }
+      for (const e of pEdges) {
+        const s = state.byId.get(String(e.source || ""));
+        const t = state.byId.get(String(e.target || ""));
+        if (!s || !t) continue;
+        state.edges.push({ source: s, target: t });
+      }
     }
     if (state.currentNid > 0) {
       const maybe = "n" + String(state.currentNid);
@@ -133,19 +268,13 @@ html, body {
     state.pan.active = false;
     state.pan.moved = false;
     canvas.style.cursor = "default";
-
-    for (const e of pEdges) {
-      const s = state.byId.get(String(e.source || ""));
-      const t = state.byId.get(String(e.target || ""));
-      if (!s || !t) continue;
-      state.edges.push({ source: s, target: t });
-    }
     layout();
   }
 
   function layout() {
-    const w = canvas.clientWidth;
-    const h = canvas.clientHeight;
+    state.layoutVersion += 1;
+    const w = state.cssW;
+    const h = state.cssH;
     if (w < 2 || h < 2 || !state.nodes.length) {
       state.boxes = new Map();
       state.neededHeight = state.nodes.length ? 96 : 0;
@@ -153,11 +282,26 @@ html, body {
       return;
     }
 
-    const preds = new Map();
-    const outs = new Map();
+    // Scratch maps and adjacency lists are kept on state and recycled between layouts.
+    const scratch = state.scratch;
+    const pool = scratch.pool;
+    function takeList() {
+      return pool.length ? pool.pop() : [];
+    }
+    function recycleLists(map) {
+      for (const list of map.values()) {
+        list.length = 0;
+        pool.push(list);
+      }
+      map.clear();
+    }
+    const preds = scratch.preds;
+    const outs = scratch.outs;
+    recycleLists(preds);
+    recycleLists(outs);
     for (const n of state.nodes) {
-      preds.set(n.id, []);
-      outs.set(n.id, []);
+      preds.set(n.id, takeList());
+      outs.set(n.id, takeList());
     }
     for (const e of state.edges) {
       outs.get(e.source.id).push(e.target.id);
@@ -169,36 +313,50 @@ html, body {
       rootId = String(state.nodes[0].id || "");
     }
 
-    const depth = new Map();
-    depth.set(rootId, 0);
-
-    const ancQueue = [rootId];
-    while (ancQueue.length) {
-      const id = ancQueue.shift();
-      const d = depth.get(id) || 0;
-      for (const p of (preds.get(id) || [])) {
-        const nd = d - 1;
-        if (!depth.has(p) || nd < (depth.get(p) || 0)) {
-          depth.set(p, nd);
-          ancQueue.push(p);
+    // Longest distance from start, via Kahn's order on the reachable subgraph. Mirrors
+    // _longest_path_depths in browser_graph.py, so cycle members get the same rows there.
+    function longestDepths(start, adj) {
+      const reach = new Set([start]);
+      const stack = [start];
+      while (stack.length) {
+        const n = stack.pop();
+        for (const m of (adj.get(n) || [])) {
+          if (!reach.has(m)) {
+            reach.add(m);
+            stack.push(m);
+          }
         }
       }
-    }
-
-    const depQueue = [rootId];
-    while (depQueue.length) {
-      const id = depQueue.shift();
-      const d = depth.get(id) || 0;
-      for (const c of (outs.get(id) || [])) {
-        const nd = d + 1;
-        if (!depth.has(c) || nd > (depth.get(c) || 0)) {
-          depth.set(c, nd);
-          depQueue.push(c);
+      const indeg = new Map();
+      for (const n of reach) indeg.set(n, 0);
+      for (const n of reach) {
+        for (const m of (adj.get(n) || [])) indeg.set(m, indeg.get(m) + 1);
+      }
+      const dist = new Map([[start, 0]]);
+      const q = [];
+      for (const n of reach) if (indeg.get(n) === 0) q.push(n);
+      for (let head = 0; head < q.length; head++) {
+        const n = q[head];
+        const base = dist.get(n);
+        for (const m of (adj.get(n) || [])) {
+          if (base !== undefined && base + 1 > (dist.has(m) ? dist.get(m) : -1)) dist.set(m, base + 1);
+          const k = indeg.get(m) - 1;
+          indeg.set(m, k);
+          if (k === 0) q.push(m);
         }
       }
+      return dist;
     }
 
-    const levels = new Map();
+    const depth = scratch.depth;
+    depth.clear();
+    for (const [id, d] of longestDepths(rootId, preds)) depth.set(id, d ? -d : 0);
+    for (const [id, d] of longestDepths(rootId, outs)) {
+      if (!depth.has(id) || d > 0) depth.set(id, d);
+    }
+
+    const levels = scratch.levels;
+    recycleLists(levels);
     let minDepth = 0;
     let maxDepth = 0;
     for (const n of state.nodes) {
@@ -206,68 +364,167 @@ html, body {
       n.depth = d;
       minDepth = Math.min(minDepth, d);
       maxDepth = Math.max(maxDepth, d);
-      if (!levels.has(d)) levels.set(d, []);
+      if (!levels.has(d)) levels.set(d, takeList());
       levels.get(d).push(n);
     }
 
     const depthKeys = Array.from(levels.keys()).sort((a, b) => a - b);
-    const orderByLevel = new Map();
+    const orderByLevel = scratch.orderByLevel;
+    const labelRank = scratch.labelRank;
+    orderByLevel.clear();
+    labelRank.clear();
     function resetLevelOrder(depthKey) {
       const list = levels.get(depthKey) || [];
       list.sort((a, b) => String(a.label).localeCompare(String(b.label)));
       const om = new Map();
-      for (let i = 0; i < list.length; i++) om.set(list[i].id, i);
+      for (let i = 0; i < list.length; i++) {
+        om.set(list[i].id, i);
+        labelRank.set(list[i].id, i);
+      }
       orderByLevel.set(depthKey, om);
     }
     for (const d of depthKeys) resetLevelOrder(d);
 
-    function neighborBary(nodeId, neighborDepth) {
-      const ids = [];
-      for (const p of (preds.get(nodeId) || [])) {
-        if ((depth.get(p) || 0) === neighborDepth) ids.push(p);
+    // Neighbors grouped by their depth once, so a sweep only reads the adjacent level's list.
+    const nbrByDepth = scratch.nbrByDepth;
+    nbrByDepth.clear();
+    function addNeighbor(id, otherId) {
+      const od = depth.get(otherId) || 0;
+      let byDepth = nbrByDepth.get(id);
+      if (!byDepth) {
+        byDepth = new Map();
+        nbrByDepth.set(id, byDepth);
+      }
+      let ids = byDepth.get(od);
+      if (!ids) {
+        ids = [];
+        byDepth.set(od, ids);
       }
-      for (const c of (outs.get(nodeId) || [])) {
-        if ((depth.get(c) || 0) === neighborDepth) ids.push(c);
+      ids.push(otherId);
+    }
+    for (const e of state.edges) {
+      addNeighbor(e.target.id, e.source.id);
+      addNeighbor(e.source.id, e.target.id);
+    }
+
+    function neighborMedian(nodeId, neighborDepth, om) {
+      const byDepth = nbrByDepth.get(nodeId);
+      const ids = byDepth ? byDepth.get(neighborDepth) : null;
+      if (!ids) return null;
+      const pos = [];
+      for (const id of ids) {
+        const p = om.get(id);
+        if (p !== undefined) pos.push(p);
       }
+      if (!pos.length) return null;
+      pos.sort((a, b) => a - b);
+      const mid = pos.length >> 1;
+      return (pos.length & 1) ? pos[mid] : (pos[mid - 1] + pos[mid]) * 0.5;
+    }
+
+    function sweepLevel(d, neighborDepth) {
+      const list = levels.get(d) || [];
+      const curOrder = orderByLevel.get(d) || new Map();
       const om = orderByLevel.get(neighborDepth) || new Map();
-      const vals = ids.map((id) => om.has(id) ? om.get(id) : null).filter((v) => v !== null);
-      if (!vals.length) return null;
-      return vals.reduce((a, b) => a + b, 0) / vals.length;
+      // Median key computed once per node per sweep instead of inside every comparison.
+      const keyed = list.map((node) => {
+        const med = neighborMedian(node.id, neighborDepth, om);
+        return {
+          node: node,
+          key: med === null ? (curOrder.get(node.id) || 0) : med,
+          rank: labelRank.get(node.id) || 0,
+        };
+      });
+      keyed.sort((a, b) => (a.key - b.key) || (a.rank - b.rank));
+      const next = new Map();
+      let changed = false;
+      for (let i = 0; i < keyed.length; i++) {
+        const id = keyed[i].node.id;
+        if (curOrder.get(id) !== i) changed = true;
+        list[i] = keyed[i].node;
+        next.set(id, i);
+      }
+      orderByLevel.set(d, next);
+      return changed;
+    }
+
+    // Edges between adjacent levels as (upper level index, upper id, lower id).
+    const levelIndex = new Map();
+    for (let i = 0; i < depthKeys.length; i++) levelIndex.set(depthKeys[i], i);
+    const layerEdges = [];
+    for (const e of state.edges) {
+      const si = levelIndex.get(depth.get(e.source.id) || 0);
+      const ti = levelIndex.get(depth.get(e.target.id) || 0);
+      if (ti === si + 1) layerEdges.push([si, e.source.id, e.target.id]);
+      else if (si === ti + 1) layerEdges.push([ti, e.target.id, e.source.id]);
+    }
+
+    function countCrossings() {
+      // Barth/Juenger/Mutzel: sort each layer pair's edges by upper position, then count
+      // inversions of the lower positions with a Fenwick tree.
+      if (!layerEdges.length) return 0;
+      const byLayer = new Map();
+      for (const [li, upId, lowId] of layerEdges) {
+        const up = orderByLevel.get(depthKeys[li]).get(upId);
+        const low = orderByLevel.get(depthKeys[li + 1]).get(lowId);
+        if (up === undefined || low === undefined) continue;
+        let pairs = byLayer.get(li);
+        if (!pairs) {
+          pairs = [];
+          byLayer.set(li, pairs);
+        }
+        pairs.push([up, low]);
+      }
+      let total = 0;
+      for (const [li, pairs] of byLayer) {
+        pairs.sort((a, b) => (a[0] - b[0]) || (a[1] - b[1]));
+        const size = (levels.get(depthKeys[li + 1]) || []).length;
+        const tree = new Int32Array(size + 1);
+        let seen = 0;
+        for (const pair of pairs) {
+          let le = 0;
+          for (let k = pair[1] + 1; k > 0; k -= k & -k) le += tree[k];
+          total += seen - le;
+          for (let k = pair[1] + 1; k <= size; k += k & -k) tree[k] += 1;
+          seen += 1;
+        }
+      }
+      return total;
+    }
+
+    function snapshotOrder() {
+      const snap = new Map();
+      for (const d of depthKeys) snap.set(d, (levels.get(d) || []).slice());
+      return snap;
     }
 
+    let bestCrossings = countCrossings();
+    let bestOrder = snapshotOrder();
+    let crossings = bestCrossings;
     for (let pass = 0; pass < 6; pass++) {
+      let changed = false;
       for (let i = 1; i < depthKeys.length; i++) {
-        const d = depthKeys[i];
-        const prev = depthKeys[i - 1];
-        const list = levels.get(d) || [];
-        const curOrder = orderByLevel.get(d) || new Map();
-        list.sort((a, b) => {
-          const ba = neighborBary(a.id, prev);
-          const bb = neighborBary(b.id, prev);
-          const fa = ba === null ? (curOrder.get(a.id) || 0) : ba;
-          const fb = bb === null ? (curOrder.get(b.id) || 0) : bb;
-          if (fa !== fb) return fa - fb;
-          return String(a.label).localeCompare(String(b.label));
-        });
-        const om = new Map();
-        for (let i = 0; i < list.length; i++) om.set(list[i].id, i);
-        orderByLevel.set(d, om);
+        if (sweepLevel(depthKeys[i], depthKeys[i - 1])) changed = true;
       }
       for (let i = depthKeys.length - 2; i >= 0; i--) {
-        const d = depthKeys[i];
-        const nxt = depthKeys[i + 1];
+        if (sweepLevel(depthKeys[i], depthKeys[i + 1])) changed = true;
+      }
+      // An unchanged pass is a fixed point: every further pass would repeat it.
+      if (!changed) break;
+      crossings = countCrossings();
+      if (crossings < bestCrossings) {
+        bestCrossings = crossings;
+        bestOrder = snapshotOrder();
+      }
+    }
+    if (crossings > bestCrossings) {
+      for (const [d, snap] of bestOrder) {
         const list = levels.get(d) || [];
-        const curOrder = orderByLevel.get(d) || new Map();
-        list.sort((a, b) => {
-          const ba = neighborBary(a.id, nxt);
-          const bb = neighborBary(b.id, nxt);
-          const fa = ba === null ? (curOrder.get(a.id) || 0) : ba;
-          const fb = bb === null ? (curOrder.get(b.id) || 0) : bb;
-          if (fa !== fb) return fa - fb;
-          return String(a.label).localeCompare(String(b.label));
-        });
         const om = new Map();
-        for (let i = 0; i < list.length; i++) om.set(list[i].id, i);
+        for (let i = 0; i < snap.length; i++) {
+          list[i] = snap[i];
+          om.set(snap[i].id, i);
+        }
         orderByLevel.set(d, om);
       }
     }
@@ -283,11 +540,39 @@ html, body {
     const offsetFactor = 0.20;
     state.boxes = new Map();
     ctx.font = "11px sans-serif";
-    const rowLayouts = [];
+    const rowLayouts = scratch.rowLayouts;
+    rowLayouts.length = 0;
 
-    function _measureRawWidth(label) {
-      const txt = String(label || "Node");
-      return Math.max(48, Math.ceil(ctx.measureText(txt).width + (padX * 2)));
+    function _measureRawWidth(node) {
+      if (node._rawW === undefined) {
+        node._labelW = ctx.measureText(String(node.label || "Node")).width;
+        node._rawW = Math.max(48, Math.ceil(node._labelW + (padX * 2)));
+      }
+      return node._rawW;
+    }
+
+    function _wrapLabel(node, maxLabelW) {
+      if (node._wrapW === maxLabelW) return node._wrap;
+      let wrapped = null;
+      if (node._labelW <= maxLabelW) {
+        wrapped = { lines: [String(node.label || "Node")], textW: node._labelW };
+      } else {
+        const key = node.label + "\x1F" + maxLabelW;
+        wrapped = state.wrapCache.get(key);
+        if (!wrapped) {
+          const lines = wrapText(node.label, maxLabelW, maxLines);
+          let textW = 0;
+          for (const line of lines) {
+            textW = Math.max(textW, ctx.measureText(line).width);
+          }
+          wrapped = { lines: lines, textW: textW };
+          if (state.wrapCache.size >= 4000) state.wrapCache.clear();
+          state.wrapCache.set(key, wrapped);
+        }
+      }
+      node._wrapW = maxLabelW;
+      node._wrap = wrapped;
+      return wrapped;
     }
 
     for (let row = 0; row < depthKeys.length; row++) {
@@ -298,7 +583,7 @@ html, body {
       const minGap = n > 1 ? singleLineNodeH : 0;
       const laneGapBase = singleLineNodeH;
 
-      const measured = list.map((node) => ({ node: node, rawW: _measureRawWidth(node.label) }));
+      const measured = list.map((node) => ({ node: node, rawW: _measureRawWidth(node) }));
 
       function _packGreedy(items) {
         const lanes = [];
@@ -328,11 +613,9 @@ html, body {
       function _buildLaneBoxes(items) {
         const out = [];
         for (const item of items) {
-          const lines = wrapText(item.node.label, maxLabelW, maxLines);
-          let textW = 0;
-          for (const line of lines) {
-            textW = Math.max(textW, ctx.measureText(line).width);
-          }
+          const wrapped = _wrapLabel(item.node, maxLabelW);
+          const lines = wrapped.lines;
+          const textW = wrapped.textW;
           const capW = Math.max(48, Math.floor(colW * 0.95));
           const boxW = Math.max(48, Math.min(capW, Math.ceil(textW + (padX * 2))));
           const boxH = Math.max(22, Math.ceil(lines.length * lineH + (padY * 2)));
@@ -457,50 +740,134 @@ html, body {
       yCursor += Number(rowLayout.totalLaneH || 0) + rowGap;
     }
   }
-  function pickNode(px, py) {
-    const wx = Number(px || 0) - Number(state.view.x || 0);
-    const wy = Number(py || 0) - Number(state.view.y || 0);
-    for (let i = state.nodes.length - 1; i >= 0; i--) {
-      const n = state.nodes[i];
-      const b = state.boxes.get(n.id);
-      if (!b) continue;
-      if (wx >= b.x && wx <= (b.x + b.w) && wy >= b.y && wy <= (b.y + b.h)) {
-        return n;
-      }
+
+  function drawFx() {
+    const w = state.cssW;
+    const h = state.cssH;
+    fxCtx.clearRect(0, 0, w, h);
+    if (w < 2 || h < 2 || !state.boxes) return;
+    fxCtx.save();
+    fxCtx.translate(Number(state.view.x || 0), Number(state.view.y || 0));
+    const cur = state.currentId ? state.boxes.get(state.currentId) : null;
+    if (cur) {
+      const n = state.byId.get(state.currentId);
+      const c = String((n && n.color) || "#3d95e7");
+      const phase = (Math.sin(performance.now() * 0.006) + 1) * 0.5;
+      const grow = 2 + (phase * 6);
+      fxCtx.globalAlpha = 0.40;
+      fxCtx.strokeStyle = c;
+      fxCtx.lineWidth = 1.8;
+      roundRect(
+        fxCtx,
+        cur.x - grow,
+        cur.y - grow,
+        cur.w + (grow * 2),
+        cur.h + (grow * 2),
+        8 + (grow * 0.35),
+      );
+      fxCtx.stroke();
+      fxCtx.globalAlpha = 1.0;
     }
-    return null;
+    const sel = state.selectedId ? state.boxes.get(state.selectedId) : null;
+    if (sel) {
+      fxCtx.strokeStyle = "#ffffff";
+      fxCtx.lineWidth = 1.8;
+      fxCtx.translate(sel.x - 2.2, sel.y - 2.2);
+      fxCtx.stroke(rectTemplate(sel.w + 4.4, sel.h + 4.4, 8));
+    }
+    fxCtx.restore();
   }
 
-  function draw() {
-    const w = canvas.clientWidth;
-    const h = canvas.clientHeight;
-    if (w < 2 || h < 2) return;
-    ctx.clearRect(0, 0, w, h);
-    const bg = String(state.bg || "").trim().toLowerCase();
-    if (bg && bg !== "transparent") {
-      ctx.fillStyle = bg;
-      ctx.fillRect(0, 0, w, h);
+  function quadInsert(q, i, xs, ys, xe, ye, depth) {
+    if (q.kids) {
+      for (const k of q.kids) {
+        if (xs[i] >= k.x0 && xe[i] <= k.x1 && ys[i] >= k.y0 && ye[i] <= k.y1) {
+          quadInsert(k, i, xs, ys, xe, ye, depth + 1);
+          return;
+        }
+      }
+      q.items.push(i);
+      return;
     }
+    q.items.push(i);
+    if (q.items.length <= 8 || depth >= 8) return;
+    // Split the leaf; boxes straddling a midline stay on this node.
+    const mx = (q.x0 + q.x1) * 0.5;
+    const my = (q.y0 + q.y1) * 0.5;
+    q.kids = [
+      { x0: q.x0, y0: q.y0, x1: mx, y1: my, items: [], kids: null },
+      { x0: mx, y0: q.y0, x1: q.x1, y1: my, items: [], kids: null },
+      { x0: q.x0, y0: my, x1: mx, y1: q.y1, items: [], kids: null },
+      { x0: mx, y0: my, x1: q.x1, y1: q.y1, items: [], kids: null },
+    ];
+    const items = q.items;
+    q.items = [];
+    for (const j of items) quadInsert(q, j, xs, ys, xe, ye, depth);
+  }
 
-    if (!state.nodes.length) {
-      ctx.fillStyle = "#9a9a9a";
-      ctx.font = "12px sans-serif";
-      ctx.fillText("No priority chains", 12, 20);
-      return;
+  function pickIndex() {
+    // Box bounds packed into flat arrays in node order plus a quadtree over them, rebuilt
+    // once per layout.
+    const cached = state.pick;
+    if (cached && cached.version === state.layoutVersion) return cached;
+    const nodes = [];
+    for (const n of state.nodes) {
+      if (state.boxes && state.boxes.has(n.id)) nodes.push(n);
     }
+    const count = nodes.length;
+    const xs = new Float64Array(count);
+    const ys = new Float64Array(count);
+    const xe = new Float64Array(count);
+    const ye = new Float64Array(count);
+    let x0 = Infinity;
+    let y0 = Infinity;
+    let x1 = -Infinity;
+    let y1 = -Infinity;
+    for (let i = 0; i < count; i++) {
+      const b = state.boxes.get(nodes[i].id);
+      xs[i] = b.x;
+      ys[i] = b.y;
+      xe[i] = b.x + b.w;
+      ye[i] = b.y + b.h;
+      x0 = Math.min(x0, xs[i]);
+      y0 = Math.min(y0, ys[i]);
+      x1 = Math.max(x1, xe[i]);
+      y1 = Math.max(y1, ye[i]);
+    }
+    const tree = { x0: x0, y0: y0, x1: x1, y1: y1, items: [], kids: null };
+    for (let i = 0; i < count; i++) quadInsert(tree, i, xs, ys, xe, ye, 0);
+    state.pick = { version: state.layoutVersion, nodes: nodes, xs: xs, ys: ys, xe: xe, ye: ye, tree: tree };
+    return state.pick;
+  }
 
-    if (!state.boxes || state.boxes.size !== state.nodes.length) {
-      layout();
+  function pickNode(px, py) {
+    const wx = Number(px || 0) - Number(state.view.x || 0);
+    const wy = Number(py || 0) - Number(state.view.y || 0);
+    const pick = pickIndex();
+    const xs = pick.xs;
+    const ys = pick.ys;
+    const xe = pick.xe;
+    const ye = pick.ye;
+    // The last node drawn wins, as with the old reverse scan.
+    let best = -1;
+    const stack = [pick.tree];
+    while (stack.length) {
+      const q = stack.pop();
+      if (wx < q.x0 || wx > q.x1 || wy < q.y0 || wy > q.y1) continue;
+      for (const i of q.items) {
+        if (i > best && wx >= xs[i] && wx <= xe[i] && wy >= ys[i] && wy <= ye[i]) best = i;
+      }
+      if (q.kids) {
+        for (const k of q.kids) stack.push(k);
+      }
     }
-    const padX = 7;
-    const padY = 5;
-    const lineH = 12;
-    const vx = Number(state.view.x || 0);
-    const vy = Number(state.view.y || 0);
-    const now = performance.now();
+    return best >= 0 ? pick.nodes[best] : null;
+  }
 
-    ctx.save();
-    ctx.translate(vx, vy);
+  function computeRouting(w) {
+    // Routes only depend on the boxes, so they are rebuilt per layout instead of per frame.
+    const cache = state.renderCache;
+    if (cache && cache.version === state.layoutVersion) return cache;
 
     function edgePoints(srcBox, dstBox) {
       if (!srcBox || !dstBox) return null;
@@ -520,8 +887,6 @@ html, body {
       };
     }
 
-    ctx.lineWidth = 1.3;
-
     function pointInRect(px, py, r) {
       return px >= r.x && px <= (r.x + r.w) && py >= r.y && py <= (r.y + r.h);
     }
@@ -546,8 +911,26 @@ html, body {
       return ((o1 > 0) !== (o2 > 0)) && ((o3 > 0) !== (o4 > 0));
     }
 
+    function hSegHitsRect(y, x1, x2, rx, ry, rw, rh) {
+      return y >= ry && y <= ry + rh && Math.max(x1, x2) >= rx && Math.min(x1, x2) <= rx + rw;
+    }
+
+    function vSegHitsRect(x, y1, y2, rx, ry, rw, rh) {
+      return x >= rx && x <= rx + rw && Math.max(y1, y2) >= ry && Math.min(y1, y2) <= ry + rh;
+    }
+
     function segmentIntersectsRect(x1, y1, x2, y2, box, pad) {
       const p = Math.max(0, Number(pad || 0));
+      // Routes are built from horizontal and vertical runs; those reduce to interval overlap.
+      if (y1 === y2 || x1 === x2) {
+        const rx = Number(box.x || 0) - p;
+        const ry = Number(box.y || 0) - p;
+        const rw = Number(box.w || 0) + (p * 2);
+        const rh = Number(box.h || 0) + (p * 2);
+        return y1 === y2
+          ? hSegHitsRect(y1, x1, x2, rx, ry, rw, rh)
+          : vSegHitsRect(x1, y1, y2, rx, ry, rw, rh);
+      }
       const r = {
         x: Number(box.x || 0) - p,
         y: Number(box.y || 0) - p,
@@ -569,58 +952,73 @@ html, body {
       );
     }
 
+    // Uniform grid over the padded boxes, so a segment only tests boxes in the cells its
+    // bounding box covers instead of every node.
+    const boxPad = 2;
+    const gridEntries = [];
+    let sumBoxW = 0;
+    let sumBoxH = 0;
+    for (const n of state.nodes) {
+      const nid = String(n.id || "");
+      if (!nid) continue;
+      const box = state.boxes.get(nid);
+      if (!box) continue;
+      gridEntries.push({ id: nid, box: box, seen: 0 });
+      sumBoxW += Number(box.w || 0);
+      sumBoxH += Number(box.h || 0);
+    }
+    const cellSize = gridEntries.length
+      ? Math.max(16, sumBoxW / gridEntries.length, sumBoxH / gridEntries.length)
+      : 16;
+    const grid = new Map();
+    function cellOf(v) {
+      return Math.floor(v / cellSize);
+    }
+    for (const entry of gridEntries) {
+      const b = entry.box;
+      const bx = Number(b.x || 0);
+      const by = Number(b.y || 0);
+      const cx0 = cellOf(bx - boxPad);
+      const cx1 = cellOf(bx + Number(b.w || 0) + boxPad);
+      const cy0 = cellOf(by - boxPad);
+      const cy1 = cellOf(by + Number(b.h || 0) + boxPad);
+      for (let cy = cy0; cy <= cy1; cy++) {
+        for (let cx = cx0; cx <= cx1; cx++) {
+          const key = cx + "," + cy;
+          const bucket = grid.get(key);
+          if (bucket) bucket.push(entry);
+          else grid.set(key, [entry]);
+        }
+      }
+    }
+    let gridQuery = 0;
+
     function pathIntersectsAnyBox(points, sourceId, targetId) {
       if (!points || points.length < 2) return false;
       for (let i = 1; i < points.length; i++) {
         const a = points[i - 1];
         const b = points[i];
-        for (const n of state.nodes) {
-          const nid = String(n.id || "");
-          if (!nid || nid === sourceId || nid === targetId) continue;
-          const box = state.boxes.get(nid);
-          if (!box) continue;
-          if (segmentIntersectsRect(a.x, a.y, b.x, b.y, box, 2)) return true;
+        gridQuery += 1;
+        const cx0 = cellOf(Math.min(a.x, b.x));
+        const cx1 = cellOf(Math.max(a.x, b.x));
+        const cy0 = cellOf(Math.min(a.y, b.y));
+        const cy1 = cellOf(Math.max(a.y, b.y));
+        for (let cy = cy0; cy <= cy1; cy++) {
+          for (let cx = cx0; cx <= cx1; cx++) {
+            const bucket = grid.get(cx + "," + cy);
+            if (!bucket) continue;
+            for (const entry of bucket) {
+              if (entry.seen === gridQuery) continue;
+              entry.seen = gridQuery;
+              if (entry.id === sourceId || entry.id === targetId) continue;
+              if (segmentIntersectsRect(a.x, a.y, b.x, b.y, entry.box, boxPad)) return true;
+            }
+          }
         }
       }
       return false;
     }
 
-    function drawRoundedOrthPath(points, radius) {
-      if (!points || points.length < 2) return;
-      const rr = Math.max(0, Number(radius || 0));
-      ctx.beginPath();
-      ctx.moveTo(points[0].x, points[0].y);
-      for (let i = 1; i < points.length - 1; i++) {
-        const p0 = points[i - 1];
-        const p1 = points[i];
-        const p2 = points[i + 1];
-        const v1x = p1.x - p0.x;
-        const v1y = p1.y - p0.y;
-        const v2x = p2.x - p1.x;
-        const v2y = p2.y - p1.y;
-        const l1 = Math.hypot(v1x, v1y);
-        const l2 = Math.hypot(v2x, v2y);
-        if (l1 < 1 || l2 < 1 || rr <= 0) {
-          ctx.lineTo(p1.x, p1.y);
-          continue;
-        }
-        const r = Math.min(rr, l1 * 0.45, l2 * 0.45);
-        const ux1 = v1x / l1;
-        const uy1 = v1y / l1;
-        const ux2 = v2x / l2;
-        const uy2 = v2y / l2;
-        const ax = p1.x - (ux1 * r);
-        const ay = p1.y - (uy1 * r);
-        const bx = p1.x + (ux2 * r);
-        const by = p1.y + (uy2 * r);
-        ctx.lineTo(ax, ay);
-        ctx.quadraticCurveTo(p1.x, p1.y, bx, by);
-      }
-      const last = points[points.length - 1];
-      ctx.lineTo(last.x, last.y);
-      ctx.stroke();
-    }
-
     const outMap = new Map();
     const inMap = new Map();
     for (const e of state.edges) {
@@ -630,12 +1028,16 @@ html, body {
       inMap.get(e.target.id).push(e);
     }
 
-    for (const [sid, arr] of outMap.entries()) {
-      arr.sort((a, b) => {
-        const ax = (state.boxes.get(a.target.id) || { x: 0 }).x;
-        const bx = (state.boxes.get(b.target.id) || { x: 0 }).x;
-        return ax - bx;
-      });
+    for (const arr of outMap.values()) {
+      if (arr.length < 2) continue;
+      // Target x read once per edge, not twice per comparison.
+      const keys = new Float64Array(arr.length);
+      for (let i = 0; i < arr.length; i++) {
+        keys[i] = (state.boxes.get(arr[i].target.id) || { x: 0 }).x;
+      }
+      const idx = Array.from(arr.keys()).sort((a, b) => keys[a] - keys[b]);
+      const sorted = idx.map((i) => arr[i]);
+      for (let i = 0; i < sorted.length; i++) arr[i] = sorted[i];
     }
 
     let minBoxX = Number.POSITIVE_INFINITY;
@@ -676,10 +1078,16 @@ html, body {
       const forkY = sy + (dir * stub);
       sourceMeta.set(sid, { sx: sx, sy: sy, dir: dir, stub: stub, forkY: forkY, outCount: Math.max(0, arr.length) });
     }
+    // Stroked runs are snapped to pixel centers once here, so the thin edge lines land on
+    // whole device pixels instead of being anti-aliased across two.
+    function snapPoint(pt) {
+      return { x: Math.round(Number(pt.x || 0)) + 0.5, y: Math.round(Number(pt.y || 0)) + 0.5 };
+    }
+
     const forkPoints = [];
     for (const meta of sourceMeta.values()) {
       if (Number(meta.outCount || 0) > 1) {
-        forkPoints.push({ x: Number(meta.sx || 0), y: Number(meta.forkY || 0) });
+        forkPoints.push(snapPoint({ x: meta.sx, y: meta.forkY }));
       }
     }
 
@@ -748,9 +1156,113 @@ html, body {
         sourceId: sourceId,
         targetId: targetId,
         dir: dir,
-        path: path,
+        path: path.map(snapPoint),
       });
     }
+    state.renderCache = {
+      version: state.layoutVersion,
+      routes: routes,
+      sourceMeta: sourceMeta,
+      forkPoints: forkPoints,
+    };
+    return state.renderCache;
+  }
+
+  function draw() {
+    drawBase();
+    drawFx();
+  }
+
+  function nodePaths() {
+    // One Path2D per node color holding every box outline, rebuilt once per layout.
+    const cached = state.nodePaths;
+    if (cached && cached.version === state.layoutVersion) return cached.groups;
+    const groups = new Map();
+    for (const n of state.nodes) {
+      const b = state.boxes.get(n.id);
+      if (!b) continue;
+      const c = String(n.color || "#3d95e7");
+      let path = groups.get(c);
+      if (!path) {
+        path = new Path2D();
+        groups.set(c, path);
+      }
+      path.addPath(rectTemplate(b.w, b.h, 7), new DOMMatrix([1, 0, 0, 1, b.x, b.y]));
+    }
+    state.nodePaths = { version: state.layoutVersion, groups: groups };
+    return groups;
+  }
+
+  function drawBase() {
+    const w = state.cssW;
+    const h = state.cssH;
+    if (w < 2 || h < 2) return;
+    if (state.nodes.length && (!state.boxes || state.boxes.size !== state.nodes.length)) {
+      layout();
+    }
+    const baseKey = [state.layoutVersion, state.view.x, state.view.y, w, h].join("|");
+    if (baseKey === state.baseKey) return;
+    state.baseKey = baseKey;
+    ctx.clearRect(0, 0, w, h);
+
+    if (!state.nodes.length) {
+      ctx.fillStyle = "#9a9a9a";
+      ctx.font = "12px sans-serif";
+      ctx.fillText("No priority chains", 12, 20);
+      return;
+    }
+
+    const padX = 7;
+    const padY = 5;
+    const lineH = 12;
+    const vx = Number(state.view.x || 0);
+    const vy = Number(state.view.y || 0);
+
+    ctx.save();
+    ctx.translate(vx, vy);
+
+    ctx.lineWidth = 1.3;
+
+    function drawRoundedOrthPath(points, radius) {
+      if (!points || points.length < 2) return;
+      const rr = Math.max(0, Number(radius || 0));
+      ctx.beginPath();
+      ctx.moveTo(points[0].x, points[0].y);
+      for (let i = 1; i < points.length - 1; i++) {
+        const p0 = points[i - 1];
+        const p1 = points[i];
+        const p2 = points[i + 1];
+        const v1x = p1.x - p0.x;
+        const v1y = p1.y - p0.y;
+        const v2x = p2.x - p1.x;
+        const v2y = p2.y - p1.y;
+        const l1 = Math.hypot(v1x, v1y);
+        const l2 = Math.hypot(v2x, v2y);
+        if (l1 < 1 || l2 < 1 || rr <= 0) {
+          ctx.lineTo(p1.x, p1.y);
+          continue;
+        }
+        const r = Math.min(rr, l1 * 0.45, l2 * 0.45);
+        const ux1 = v1x / l1;
+        const uy1 = v1y / l1;
+        const ux2 = v2x / l2;
+        const uy2 = v2y / l2;
+        const ax = p1.x - (ux1 * r);
+        const ay = p1.y - (uy1 * r);
+        const bx = p1.x + (ux2 * r);
+        const by = p1.y + (uy2 * r);
+        ctx.lineTo(ax, ay);
+        ctx.quadraticCurveTo(p1.x, p1.y, bx, by);
+      }
+      const last = points[points.length - 1];
+      ctx.lineTo(last.x, last.y);
+      ctx.stroke();
+    }
+
+    const routing = computeRouting(w);
+    const routes = routing.routes;
+    const sourceMeta = routing.sourceMeta;
+    const forkPoints = routing.forkPoints;
 
     ctx.strokeStyle = "#3d95e7";
     ctx.lineJoin = "round";
@@ -825,58 +1337,21 @@ html, body {
       ctx.arc(Number(fp.x || 0), Number(fp.y || 0), joinR, 0, Math.PI * 2);
       ctx.fill();
     }
-    function roundRect(x, y, w, h, r) {
-      const rr = Math.min(r, w * 0.5, h * 0.5);
-      ctx.beginPath();
-      ctx.moveTo(x + rr, y);
-      ctx.lineTo(x + w - rr, y);
-      ctx.quadraticCurveTo(x + w, y, x + w, y + rr);
-      ctx.lineTo(x + w, y + h - rr);
-      ctx.quadraticCurveTo(x + w, y + h, x + w - rr, y + h);
-      ctx.lineTo(x + rr, y + h);
-      ctx.quadraticCurveTo(x, y + h, x, y + h - rr);
-      ctx.lineTo(x, y + rr);
-      ctx.quadraticCurveTo(x, y, x + rr, y);
-      ctx.closePath();
-    }
 
-    for (const n of state.nodes) {
-      const b = state.boxes.get(n.id);
-      if (!b) continue;
-      const c = String(n.color || "#3d95e7");
+    ctx.lineWidth = 1.4;
+    for (const [c, path] of nodePaths()) {
       ctx.globalAlpha = 0.24;
       ctx.fillStyle = c;
-      roundRect(b.x, b.y, b.w, b.h, 7);
-      ctx.fill();
+      ctx.fill(path);
       ctx.globalAlpha = 1.0;
       ctx.strokeStyle = c;
-      ctx.lineWidth = 1.4;
-      roundRect(b.x, b.y, b.w, b.h, 7);
-      ctx.stroke();
-      if (state.currentId && n.id === state.currentId) {
-        const phase = (Math.sin(now * 0.006) + 1) * 0.5;
-        const grow = 2 + (phase * 6);
-        ctx.globalAlpha = 0.40;
-        ctx.strokeStyle = c;
-        ctx.lineWidth = 1.8;
-        roundRect(
-          b.x - grow,
-          b.y - grow,
-          b.w + (grow * 2),
-          b.h + (grow * 2),
-          8 + (grow * 0.35),
-        );
-        ctx.stroke();
-        ctx.globalAlpha = 1.0;
-      }
-      if (state.selectedId && n.id === state.selectedId) {
-        ctx.strokeStyle = "#ffffff";
-        ctx.lineWidth = 1.8;
-        roundRect(b.x - 2.2, b.y - 2.2, b.w + 4.4, b.h + 4.4, 8);
-        ctx.stroke();
-      }
+      ctx.stroke(path);
+    }
 
-      ctx.fillStyle = "#f2f2f2";
+    ctx.fillStyle = "#f2f2f2";
+    for (const n of state.nodes) {
+      const b = state.boxes.get(n.id);
+      if (!b) continue;
       const lines = b.lines || [];
       for (let li = 0; li < lines.length; li++) {
         ctx.fillText(lines[li], b.x + padX, b.y + padY + 10 + (li * lineH));
@@ -907,7 +1382,8 @@ html, body {
     }
     state.view.x = state.pan.ox + dx;
     state.view.y = state.pan.oy + dy;
-    draw();
+    // Pointer events can outpace the display; the pan offset is current, the repaint waits a frame.
+    schedule();
   });
 
   window.addEventListener("mouseup", () => {
@@ -931,60 +1407,179 @@ html, body {
     if (n && n.id) {
       state.selectedId = String(n.id);
       pycmd("AJPCPrioChain-selectNid:" + String(Number(n.nid || 0)));
-      draw();
+      schedule();
       return;
     }
     state.selectedId = "";
     pycmd("AJPCPrioChain-selectNid:0");
-    draw();
+    schedule();
   });
 
-  window.addEventListener("resize", () => {
-    resize();
-    layout();
-    draw();
-  });
+  function scheduleLayout() {
+    // Drag-resizing fires many events per frame; relayout once on the next one.
+    state.needsResize = true;
+    schedule();
+  }
+
+  // Only real size changes of the view reach the pipeline; fall back to window resizes.
+  if (typeof ResizeObserver === "function") {
+    new ResizeObserver(scheduleLayout).observe(root);
+  } else {
+    window.addEventListener("resize", scheduleLayout);
+  }
+
+  function canAnimate() {
+    return !!state.currentId && state.onScreen && !document.hidden;
+  }
+
+  function schedule() {
+    // Event handlers only mark the view dirty; one frame repaints however many changes landed.
+    state.needsDraw = true;
+    scheduleFrame();
+  }
+
+  function scheduleFrame() {
+    if (!state.frameRaf && (state.needsDraw || canAnimate())) {
+      state.frameRaf = requestAnimationFrame(frame);
+    }
+  }
 
   function frame() {
-    draw();
-    requestAnimationFrame(frame);
+    // Besides queued redraws only the current-node pulse animates, on the overlay.
+    // The loop stops while there is nothing to pulse or the view cannot be seen.
+    state.frameRaf = 0;
+    if (state.needsResize) {
+      state.needsResize = false;
+      const prevW = state.cssW;
+      const prevH = state.cssH;
+      resize();
+      // Layout works in CSS pixels; a pixel-ratio-only change just needs the repaint.
+      if (state.cssW !== prevW || state.cssH !== prevH) layout();
+    }
+    if (state.needsDraw) {
+      state.needsDraw = false;
+      draw();
+    } else if (canAnimate() && state.cssW >= 2 && state.cssH >= 2) {
+      drawFx();
+    }
+    scheduleFrame();
+  }
+
+  if (typeof IntersectionObserver === "function") {
+    new IntersectionObserver((entries) => {
+      const entry = entries[entries.length - 1];
+      state.onScreen = !!(entry && entry.isIntersecting);
+      scheduleFrame();
+    }).observe(root);
   }
+  document.addEventListener("visibilitychange", scheduleFrame);
 
   window.AJPCPrioChain = {
     setData(payload) {
       build(payload || {});
-      draw();
+      if ((state.nodes.length > 200) !== state.largeGraph) resize();
+      schedule();
     },
     setBackground(color) {
-      if (typeof color === "string" && color.trim()) {
-        state.bg = color.trim();
-      }
-      draw();
+      if (typeof color !== "string" || !color.trim()) return;
+      const bg = color.trim();
+      if (bg === state.bg) return;
+      state.bg = bg;
+      root.style.background = bg;
     },
     selectNid(nid) {
       const n = Number(nid || 0);
       if (!(n > 0)) {
         state.selectedId = "";
-        draw();
+        schedule();
         return;
       }
       const key = "n" + String(n);
       state.selectedId = state.byId.has(key) ? key : "";
-      draw();
+      schedule();
     },
   };
 
+  resize();
   if (window.__AJPC_PRIO_DATA) {
     window.AJPCPrioChain.setData(window.__AJPC_PRIO_DATA);
   }
-
-  resize();
-  frame();
+  schedule();
 })();
 </script>
 """
 
 
+def _minify_html(html: str) -> str:
+    # Indentation, blank lines and whole-line // comments only; nothing inside a line is touched.
+    out: list[str] = []
+    for line in html.splitlines():
+        line = line.strip()
+        if not line or line.startswith("//"):
+            continue
+        out.append(line)
+    return "\n".join(out)
+
+
+# Built once at import; every PrioChainView loads the same, smaller page.
+_HTML_MIN = _minify_html(_HTML)
+
+
+def _columnar_payload(payload: dict[str, Any]) -> dict[str, Any]:
+    ids: list[str] = []
+    nids: list[int] = []
+    labels: list[str] = []
+    colors: list[str] = []
+    index: dict[str, int] = {}
+    for n in payload.get("nodes") or []:
+        if not isinstance(n, dict):
+            continue
+        node_id = str(n.get("id") or "")
+        if not node_id:
+            continue
+        try:
+            nid = int(n.get("nid") or 0)
+        except Exception:
+            nid = 0
+        index[node_id] = len(ids)
+        ids.append(node_id)
+        nids.append(nid)
+        labels.append(str(n.get("label") or "Node"))
+        colors.append(str(n.get("color") or "#3d95e7"))
+    edges: list[int] = []
+    for e in payload.get("edges") or []:
+        if not isinstance(e, dict):
+            continue
+        si = index.get(str(e.get("source") or ""))
+        ti = index.get(str(e.get("target") or ""))
+        if si is None or ti is None:
+            continue
+        edges.append(si)
+        edges.append(ti)
+    out: dict[str, Any] = {"ids": ids, "nids": nids, "labels": labels, "colors": colors, "edges": edges}
+    for key in ("current_nid", "current_id"):
+        if key in payload:
+            out[key] = payload[key]
+    return out
+
+
+def _encode_payload(payload: dict[str, Any] | str | None) -> str:
+    # Compact ASCII JSON, which is also a valid JS object literal: pushed as-is, with no
+    # second string-literal encoding and no JSON.parse on the page.
+    # Payloads go over as columns so build() can skip per-field coercion and id lookups.
+    if isinstance(payload, str):
+        try:
+            payload = json.loads(payload or "{}")
+        except Exception:
+            payload = None
+    if not isinstance(payload, dict):
+        payload = {}
+    try:
+        return json.dumps(_columnar_payload(payload), ensure_ascii=True, separators=(",", ":"))
+    except Exception:
+        return "{}"
+
+
 class PrioChainView(QWidget):
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
@@ -992,6 +1587,21 @@ class PrioChainView(QWidget):
         self._on_select: Callable[[int], None] | None = None
         self._on_needed_height: Callable[[int], None] | None = None
         self._pending: dict[str, Any] = {"nodes": [], "edges": []}
+        self._pending_js = _encode_payload(self._pending)
+        # Latest queued statement per kind, flushed as one eval on the next event-loop turn.
+        self._queued_js: dict[str, str] = {}
+        self._flush_scheduled = False
+        # Last background / selection sent to (or reported by) the page; repeats are dropped.
+        self._last_bg: str | None = None
+        self._last_selected: int | None = None
+        # Last nid asked for (or picked in the page); survives resets of the dedupe guard above.
+        self._requested_select: int | None = None
+        self._bridge_handlers: dict[str, Callable[[str], None]] = {
+            "domDone": self._handle_dom_done,
+            "AJPCPrioChain-openEditor": self._handle_open_editor,
+            "AJPCPrioChain-selectNid": self._handle_select,
+            "AJPCPrioChain-neededHeight": self._handle_needed_height,
+        }
         self.setMinimumHeight(130)
         self._view = AnkiWebView(parent=self, title="ajpc_prio_chain")
         self._view.set_bridge_command(self._on_bridge, self)
@@ -1007,7 +1617,7 @@ class PrioChainView(QWidget):
         lay.setSpacing(0)
         lay.addWidget(self._view)
 
-        self._view.stdHtml(_HTML, context=self)
+        self._view.stdHtml(_HTML_MIN, context=self)
 
     def set_open_editor_handler(self, callback: Callable[[int], None] | None) -> None:
         self._on_open_editor = callback
@@ -1018,17 +1628,26 @@ class PrioChainView(QWidget):
     def set_needed_height_handler(self, callback: Callable[[int], None] | None) -> None:
         self._on_needed_height = callback
 
-    def set_data(self, payload: dict[str, Any]) -> None:
-        self._pending = payload or {"nodes": [], "edges": []}
+    def set_data(self, payload: dict[str, Any] | str) -> None:
+        # A str payload is JSON text; either way the pushed literal is built once, not per push.
+        data_js = _encode_payload(payload)
+        if data_js == self._pending_js:
+            return
+        self._pending = payload if isinstance(payload, dict) else {}
+        self._pending_js = data_js
+        # setData may drop a selection whose node is gone, so the next select_nid always goes out.
+        self._last_selected = None
         self._push()
 
     def set_background(self, color: str) -> None:
         c = str(color or "").strip() or "#1f1f1f"
+        if c == self._last_bg:
+            return
+        self._last_bg = c
         js_c = json.dumps(c, ensure_ascii=True)
-        self._view.eval(
-            "if (window.AJPCPrioChain) { window.AJPCPrioChain.setBackground("
-            + js_c
-            + "); }"
+        self._enqueue(
+            "background",
+            "if (window.AJPCPrioChain) { window.AJPCPrioChain.setBackground(" + js_c + "); }",
         )
 
     def select_nid(self, nid: int) -> None:
@@ -1036,45 +1655,81 @@ class PrioChainView(QWidget):
             n = int(nid)
         except Exception:
             n = 0
-        self._view.eval(
-            "if (window.AJPCPrioChain) { window.AJPCPrioChain.selectNid("
-            + str(n)
-            + "); }"
+        self._requested_select = n
+        if n == self._last_selected:
+            return
+        self._last_selected = n
+        self._enqueue(
+            "select",
+            "if (window.AJPCPrioChain) { window.AJPCPrioChain.selectNid(" + str(n) + "); }",
         )
 
     def _push(self) -> None:
+        self._enqueue(
+            "data",
+            "window.__AJPC_PRIO_DATA = " + self._pending_js + ";"
+            "if (window.AJPCPrioChain) { window.AJPCPrioChain.setData(window.__AJPC_PRIO_DATA); }",
+        )
+
+    def _enqueue(self, kind: str, js: str) -> None:
+        # A newer statement of the same kind supersedes the queued one.
+        self._queued_js[kind] = js
+        if self._flush_scheduled:
+            return
+        self._flush_scheduled = True
+        QTimer.singleShot(0, self._flush)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        queued = self._queued_js
+        if not queued:
+            return
+        self._queued_js = {}
+        # Data first so a queued selection applies to the nodes it was meant for.
+        parts = [queued[k] for k in ("data", "background", "select") if k in queued]
         try:
-            data = json.dumps(self._pending or {}, ensure_ascii=False)
-            data_js = json.dumps(data, ensure_ascii=True)
+            self._view.eval("\n".join(parts))
         except Exception:
-            data_js = json.dumps("{}", ensure_ascii=True)
-        self._view.eval(
-            "window.__AJPC_PRIO_DATA = JSON.parse(" + data_js + ");"
-            "if (window.AJPCPrioChain) { window.AJPCPrioChain.setData(window.__AJPC_PRIO_DATA); }"
-        )
+            return
 
     def _on_bridge(self, cmd: str):
         if not isinstance(cmd, str):
             return None
-        if cmd == "domDone":
-            self._push()
-            return None
-        if cmd.startswith("AJPCPrioChain-openEditor:"):
-            raw = cmd.split(":", 1)[1].strip()
-            if raw.isdigit():
-                nid = int(raw)
-                if callable(self._on_open_editor):
-                    self._on_open_editor(nid)
-                else:
-                    open_note_editor(nid, title="AJpC Note Editor")
-            return None
-        if cmd.startswith("AJPCPrioChain-selectNid:"):
-            raw = cmd.split(":", 1)[1].strip()
-            if raw.isdigit() and callable(self._on_select):
-                self._on_select(int(raw))
-            return None
-        if cmd.startswith("AJPCPrioChain-neededHeight:"):
-            raw = cmd.split(":", 1)[1].strip()
-            if raw.isdigit() and callable(self._on_needed_height):
-                self._on_needed_height(int(raw))
+        prefix, _sep, raw = cmd.partition(":")
+        handler = self._bridge_handlers.get(prefix)
+        if handler is not None:
+            handler(raw.strip())
         return None
+
+    def _handle_dom_done(self, _raw: str) -> None:
+        # A (re)loaded page starts from scratch, so resend everything.
+        self._last_selected = None
+        self._push()
+        bg = self._last_bg
+        if bg is not None:
+            self._last_bg = None
+            self.set_background(bg)
+        if self._requested_select is not None:
+            self.select_nid(self._requested_select)
+
+    def _handle_open_editor(self, raw: str) -> None:
+        if not raw.isdigit():
+            return
+        nid = int(raw)
+        if callable(self._on_open_editor):
+            self._on_open_editor(nid)
+        else:
+            open_note_editor(nid, title="AJpC Note Editor")
+
+    def _handle_select(self, raw: str) -> None:
+        if not raw.isdigit():
+            return
+        # The page changed its own selection; track it so a later select_nid is not dropped.
+        self._last_selected = int(raw)
+        self._requested_select = int(raw)
+        if callable(self._on_select):
+            self._on_select(int(raw))
+
+    def _handle_needed_height(self, raw: str) -> None:
+        if raw.isdigit() and callable(self._on_needed_height):
+            self._on_needed_height(int(raw))
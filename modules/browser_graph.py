@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import functools
 import json
 import os
 import re
+import sys
 import weakref
+from collections import OrderedDict, defaultdict, deque
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Iterable
 
 import aqt.editor
 from aqt import gui_hooks, mw
@@ -13,6 +16,7 @@ from aqt.qt import (
     QApplication,
     QBrush,
     QColor,
+    QEvent,
     QFont,
     QLabel,
     QListWidget,
@@ -31,25 +35,36 @@ from aqt.editor import Editor
 from aqt.browser.previewer import Previewer
 from anki.cards import Card
 
-from . import ModuleSpec
+from . import ModuleSpec, link_core
 from ._force_graph_view import ForceGraphView
+from ._link_renderer import iter_raw_links
 from ._note_editor import open_note_editor
 from ._prio_chain_view import PrioChainView
 
-_RAW_LINK_RE = re.compile(r"\[((?:[^\[]|\\\[)*?)\|(nid|cid)(\d+)\]", re.IGNORECASE)
 _BROWSERS: "weakref.WeakSet[Any]" = weakref.WeakSet()
+_PENDING_REFRESH: "weakref.WeakSet[Any]" = weakref.WeakSet()
+_REFRESH_FLUSH_SCHEDULED = False
+_ROW_REFRESH_DELAY_MS = 30
+_LINK_RELEVANT_FLAGS = ("note_text", "note", "card", "tags", "deck", "notetype", "browser_table")
 _ADDON_DIR = os.path.dirname(os.path.dirname(__file__))
 _CONFIG_PATH = os.path.join(_ADDON_DIR, "config.json")
+_CHAIN_CACHE_MAX = 64
+_PRIO_WIDTH_BUCKET = 16
+_BUCKET_FAMILY_PRIO = sys.intern("family_prio")
+_INCOMING_IDX: dict[tuple[str, int], set[int]] = {}
+_INCOMING_SRC_LINKS: dict[int, set[tuple[str, int]]] = {}
+_INCOMING_IDX_STATE: dict[str, int] = {}
+_CHAIN_CACHE: "OrderedDict[tuple[Any, ...], tuple[set[int], list[tuple[int, int]], dict[int, str]]]" = OrderedDict()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ParsedLink:
     label: str
     kind: str
     target_id: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PanelItem:
     text: str
     open_nid: int
@@ -60,7 +75,7 @@ class PanelItem:
     clickable: bool = True
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class _FamilyRef:
     fid: str
     prio: int
@@ -71,14 +86,9 @@ def _parse_raw_links(text: str) -> list[ParsedLink]:
     out: list[ParsedLink] = []
     if not text:
         return out
-    for m in _RAW_LINK_RE.finditer(text):
-        label = str(m.group(1) or "").replace("\\[", "[")
-        kind = str(m.group(2) or "").lower()
-        try:
-            target = int(m.group(3))
-        except Exception:
-            continue
-        out.append(ParsedLink(label=label, kind=kind, target_id=target))
+    append = out.append
+    for _start, _end, label, kind, target in iter_raw_links(text):
+        append(ParsedLink(label=label, kind=kind, target_id=int(target)))
     return out
 
 
@@ -127,19 +137,44 @@ def _parse_family_refs(raw: str, sep: str, default_prio: int) -> list[_FamilyRef
     return out
 
 
+def _note_bulk(nids: Iterable[int]) -> dict[int, tuple[str, int]]:
+    out: dict[int, tuple[str, int]] = {}
+    if mw is None or not getattr(mw, "col", None):
+        return out
+    ids = sorted({x for x in nids if x > 0})
+    if not ids:
+        return out
+    placeholders = ",".join("?" for _ in ids)
+    try:
+        rows = mw.col.db.all(
+            f"select id, sfld, mid from notes where id in ({placeholders})",
+            *ids,
+        )
+    except Exception:
+        return out
+    for nid, sfld, mid in rows:
+        label = str(sfld or "").strip()
+        out[nid] = (label or str(nid), int(mid or 0))
+    return out
+
+
 def _note_labels_by_nid(nids: set[int]) -> dict[int, str]:
-    out: dict[int, str] = {}
     if not nids:
-        return out
+        return {}
+    return {nid: label for nid, (label, _mid) in _note_bulk(nids).items()}
+
+
+def _bulk_fields(nids: Iterable[int]) -> dict[int, tuple[int, list[str]]]:
+    out: dict[int, tuple[int, list[str]]] = {}
     if mw is None or not getattr(mw, "col", None):
         return out
-    ids = sorted(int(x) for x in nids if int(x) > 0)
+    ids = sorted({int(x) for x in nids if int(x) > 0})
     if not ids:
         return out
     placeholders = ",".join("?" for _ in ids)
     try:
         rows = mw.col.db.all(
-            f"select id, sfld from notes where id in ({placeholders})",
+            f"select id, mid, flds from notes where id in ({placeholders})",
             *ids,
         )
     except Exception:
@@ -147,28 +182,81 @@ def _note_labels_by_nid(nids: set[int]) -> dict[int, str]:
     for row in rows:
         try:
             nid = int(row[0])
+            mid = int(row[1])
         except Exception:
             continue
-        label = str(row[1] or "").strip()
-        out[nid] = label or str(nid)
+        out[nid] = (mid, str(row[2] or "").split("\x1f"))
     return out
 
 
+def _field_index(mid: int, field_name: str, cache: dict[tuple[int, str], int]) -> int:
+    key = (int(mid), str(field_name))
+    if key in cache:
+        return cache[key]
+    idx = -1
+    try:
+        model = mw.col.models.get(int(mid))
+        flds = model.get("flds", []) if isinstance(model, dict) else []
+        for i, fld in enumerate(flds):
+            if isinstance(fld, dict) and str(fld.get("name", "")) == field_name:
+                idx = i
+                break
+    except Exception:
+        idx = -1
+    cache[key] = idx
+    return idx
+
+
 def _family_prio_chain(current_nid: int) -> tuple[set[int], list[tuple[int, int]], dict[int, str]]:
-    chain_nodes: set[int] = set()
-    chain_edges: list[tuple[int, int]] = []
-    labels: dict[int, str] = {}
+    _key, nodes, edges, labels = _family_prio_chain_keyed(current_nid)
+    return nodes, edges, labels
+
+
+def _family_prio_chain_keyed(
+    current_nid: int,
+) -> tuple[tuple[Any, ...] | None, set[int], list[tuple[int, int]], dict[int, str]]:
+    # Also returns the memo key, so callers can key their own caches on the same inputs.
+    current_nid = int(current_nid or 0)
     if current_nid <= 0:
-        return chain_nodes, chain_edges, labels
+        return None, set(), [], {}
     if mw is None or not getattr(mw, "col", None):
-        return chain_nodes, chain_edges, labels
+        return None, set(), [], {}
 
     try:
-        note = mw.col.get_note(int(current_nid))
+        note = mw.col.get_note(current_nid)
     except Exception:
-        return chain_nodes, chain_edges, labels
+        return None, set(), [], {}
+    try:
+        col_mod = int(mw.col.db.scalar("select mod from col") or 0)
+    except Exception:
+        col_mod = 0
 
-    family_field, family_sep, default_prio = _family_cfg()
+    family_cfg = _family_cfg()
+    cache_key = (current_nid, int(getattr(note, "mod", 0) or 0), col_mod, family_cfg)
+    cached = _CHAIN_CACHE.get(cache_key)
+    if cached is not None:
+        _CHAIN_CACHE.move_to_end(cache_key)
+        nodes, edges, labels = cached
+        return cache_key, set(nodes), list(edges), dict(labels)
+
+    result = _compute_family_prio_chain(current_nid, note, family_cfg)
+    _CHAIN_CACHE[cache_key] = result
+    while len(_CHAIN_CACHE) > _CHAIN_CACHE_MAX:
+        _CHAIN_CACHE.popitem(last=False)
+    nodes, edges, labels = result
+    return cache_key, set(nodes), list(edges), dict(labels)
+
+
+def _compute_family_prio_chain(
+    current_nid: int,
+    note,
+    family_cfg: tuple[str, str, int],
+) -> tuple[set[int], list[tuple[int, int]], dict[int, str]]:
+    chain_nodes: set[int] = set()
+    chain_edges: list[tuple[int, int]] = []
+    labels: dict[int, str] = {}
+
+    family_field, family_sep, default_prio = family_cfg
     if family_field not in note:
         return chain_nodes, chain_edges, labels
 
@@ -180,34 +268,34 @@ def _family_prio_chain(current_nid: int) -> tuple[set[int], list[tuple[int, int]
     if not fids:
         return chain_nodes, chain_edges, labels
 
-    edge_seen: set[tuple[int, int]] = set()
+    # Edges packed into one int: a single hash per lookup and no tuple per candidate.
+    edge_seen: set[int] = set()
+    field_idx_cache: dict[tuple[int, str], int] = {}
     for fid in fids:
         like = f"%{fid}%"
         try:
             rows = mw.col.db.all("select id from notes where flds like ?", like)
         except Exception:
             rows = []
-        nids = {int(current_nid)}
-        for row in rows:
-            try:
-                nids.add(int(row[0]))
-            except Exception:
-                continue
+        nids = {current_nid}
+        nids.update(int(row[0]) for row in rows)
 
         by_prio: dict[int, set[int]] = {}
         explicit_any = False
+        fields_by_nid = _bulk_fields(nids)
         for nid in sorted(nids):
-            try:
-                n = mw.col.get_note(int(nid))
-            except Exception:
+            entry = fields_by_nid.get(nid)
+            if entry is None:
                 continue
-            if family_field not in n:
+            mid, fields = entry
+            idx = _field_index(mid, family_field, field_idx_cache)
+            if idx < 0 or idx >= len(fields):
                 continue
-            refs = _parse_family_refs(str(n[family_field] or ""), family_sep, default_prio)
+            refs = _parse_family_refs(str(fields[idx] or ""), family_sep, default_prio)
             for ref in refs:
                 if ref.fid != fid:
                     continue
-                by_prio.setdefault(int(ref.prio), set()).add(int(nid))
+                by_prio.setdefault(ref.prio, set()).add(nid)
                 if ref.explicit:
                     explicit_any = True
 
@@ -224,33 +312,33 @@ def _family_prio_chain(current_nid: int) -> tuple[set[int], list[tuple[int, int]
                 for dst in by_prio.get(dst_pr, set()):
                     if src == dst:
                         continue
-                    key = (int(src), int(dst))
+                    key = (src << 64) | dst
                     if key in edge_seen:
                         continue
                     edge_seen.add(key)
-                    chain_edges.append(key)
+                    chain_edges.append((src, dst))
 
     if chain_edges:
         forward: dict[int, set[int]] = {}
         reverse: dict[int, set[int]] = {}
         for src, dst in chain_edges:
-            forward.setdefault(int(src), set()).add(int(dst))
-            reverse.setdefault(int(dst), set()).add(int(src))
+            forward.setdefault(src, set()).add(dst)
+            reverse.setdefault(dst, set()).add(src)
 
         # Keep only the subgraph that is actually connected to current note:
         # ancestors(current) U descendants(current) U current.
-        relevant: set[int] = {int(current_nid)}
-        stack = [int(current_nid)]
+        relevant: set[int] = {current_nid}
+        stack = [current_nid]
         while stack:
-            cur = int(stack.pop())
+            cur = stack.pop()
             for parent in reverse.get(cur, set()):
                 if parent in relevant:
                     continue
                 relevant.add(parent)
                 stack.append(parent)
-        stack = [int(current_nid)]
+        stack = [current_nid]
         while stack:
-            cur = int(stack.pop())
+            cur = stack.pop()
             for child in forward.get(cur, set()):
                 if child in relevant:
                     continue
@@ -259,44 +347,48 @@ def _family_prio_chain(current_nid: int) -> tuple[set[int], list[tuple[int, int]
 
         filtered_edges: list[tuple[int, int]] = []
         for src, dst in chain_edges:
-            if int(src) in relevant and int(dst) in relevant:
-                filtered_edges.append((int(src), int(dst)))
+            if src in relevant and dst in relevant:
+                filtered_edges.append((src, dst))
         chain_edges = filtered_edges
-        chain_nodes = {int(n) for n in chain_nodes if int(n) in relevant}
-        chain_nodes.add(int(current_nid))
+        chain_nodes = {n for n in chain_nodes if n in relevant}
+        chain_nodes.add(current_nid)
 
     if chain_nodes:
-        labels = _note_labels_by_nid(set(chain_nodes))
+        labels = _note_labels_by_nid(chain_nodes)
     return chain_nodes, chain_edges, labels
 
 
-def _accent_colors_for_nids(nids: set[int]) -> dict[int, str]:
+def _model_accent_color(mid: int) -> str:
+    try:
+        model = mw.col.models.get(int(mid))
+        css = str(model.get("css", "") or "") if isinstance(model, dict) else ""
+        m = re.search(r"--accent\s*:\s*([^;]+);", css, re.IGNORECASE)
+        if m:
+            return str(m.group(1) or "").strip()
+    except Exception:
+        pass
+    return ""
+
+
+def _accent_colors_for_nids(
+    nids: set[int],
+    bulk: dict[int, tuple[str, int]] | None = None,
+) -> dict[int, str]:
     out: dict[int, str] = {}
     if not nids:
         return out
     if mw is None or not getattr(mw, "col", None):
         return out
-
-    mid_cache: dict[int, str] = {}
-    for nid in sorted(int(x) for x in nids if int(x) > 0):
-        try:
-            note = mw.col.get_note(int(nid))
-            mid = int(note.mid)
-        except Exception:
+    if bulk is None:
+        bulk = _note_bulk(nids)
+    color_by_mid = {mid: _model_accent_color(mid) for mid in {m for _label, m in bulk.values()}}
+    for nid in nids:
+        entry = bulk.get(nid)
+        if entry is None:
             continue
-        if mid not in mid_cache:
-            color = ""
-            try:
-                model = mw.col.models.get(mid)
-                css = str(model.get("css", "") or "") if isinstance(model, dict) else ""
-                m = re.search(r"--accent\s*:\s*([^;]+);", css, re.IGNORECASE)
-                if m:
-                    color = str(m.group(1) or "").strip()
-            except Exception:
-                color = ""
-            mid_cache[mid] = color
-        if mid_cache.get(mid):
-            out[int(nid)] = mid_cache[mid]
+        color = color_by_mid.get(entry[1], "")
+        if color:
+            out[nid] = color
     return out
 
 
@@ -442,10 +534,6 @@ def _provider_refs(payload) -> list[ParsedLink]:
 
 
 def _iter_link_core_providers():
-    try:
-        from . import link_core
-    except Exception:
-        return []
     try:
         items = list(link_core._iter_providers())  # type: ignore[attr-defined]
         return items
@@ -489,20 +577,23 @@ def _collect_auto_outgoing(card, manual_refs: list[ParsedLink]) -> list[tuple[st
     except Exception:
         return []
 
-    try:
-        from . import link_core
-    except Exception:
-        return []
-
     base_nids = {int(ref.target_id) for ref in manual_refs if ref.kind == "nid"}
     base_cids = {int(ref.target_id) for ref in manual_refs if ref.kind == "cid"}
 
+    providers = [
+        (provider_id, provider)
+        for provider_id, _prio, provider in _iter_link_core_providers()
+        if _provider_category(provider_id) in ("family", "mass")
+    ]
     seen: set[tuple[str, int, str]] = set()
     out: list[tuple[str, ParsedLink]] = []
-    for kind in ("reviewQuestion", "reviewAnswer"):
+    for kind_idx, kind in enumerate(("reviewQuestion", "reviewAnswer")):
         known_nids = set(base_nids)
         known_cids = set(base_cids)
-        for provider_id, _prio, provider in _iter_link_core_providers():
+        for provider_id, provider in providers:
+            # Providers that ignore ctx.kind yield the same refs on both sides.
+            if kind_idx > 0 and not getattr(provider, "kind_dependent", False):
+                continue
             try:
                 ctx = link_core.ProviderContext(
                     card=card,
@@ -516,8 +607,6 @@ def _collect_auto_outgoing(card, manual_refs: list[ParsedLink]) -> list[tuple[st
             except Exception:
                 continue
             category = _provider_category(provider_id)
-            if category not in ("family", "mass"):
-                continue
             for payload in payloads:
                 for ref in _provider_refs(payload):
                     if ref.target_id <= 0:
@@ -534,7 +623,107 @@ def _collect_auto_outgoing(card, manual_refs: list[ParsedLink]) -> list[tuple[st
     return out
 
 
+def _index_note_links(src_nid: int, flds: str) -> None:
+    new_keys: set[tuple[str, int]] = set()
+    for field_text in str(flds or "").split("\x1f"):
+        for ref in _parse_raw_links(field_text):
+            new_keys.add((ref.kind, ref.target_id))
+    old_keys = _INCOMING_SRC_LINKS.get(src_nid, set())
+    for key in old_keys - new_keys:
+        srcs = _INCOMING_IDX.get(key)
+        if srcs is None:
+            continue
+        srcs.discard(src_nid)
+        if not srcs:
+            del _INCOMING_IDX[key]
+    for key in new_keys - old_keys:
+        _INCOMING_IDX.setdefault(key, set()).add(src_nid)
+    if new_keys:
+        _INCOMING_SRC_LINKS[src_nid] = new_keys
+    else:
+        _INCOMING_SRC_LINKS.pop(src_nid, None)
+
+
+def _drop_incoming_index() -> None:
+    _INCOMING_IDX.clear()
+    _INCOMING_SRC_LINKS.clear()
+    _INCOMING_IDX_STATE.clear()
+
+
+def _index_live_note(note) -> None:
+    if note is None or mw is None or not getattr(mw, "col", None):
+        return
+    if _INCOMING_IDX_STATE.get("col") != id(mw.col):
+        return
+    try:
+        nid = int(note.id)
+        flds = "\x1f".join(str(x or "") for x in note.fields)
+    except Exception:
+        return
+    if nid > 0:
+        _index_note_links(nid, flds)
+
+
+def _sync_incoming_index() -> bool:
+    # Built once per collection (a full sync or .colpkg import opens a new one). After that,
+    # notes with mod at or after the newest mod seen are re-read; added notes and editor saves
+    # are also indexed from their hooks. Sync and import-like ops can keep a note's older mod,
+    # so those drop the index instead (see _on_sync_did_finish / _changes_may_keep_old_mod).
+    if mw is None or not getattr(mw, "col", None):
+        return False
+    col = mw.col
+    try:
+        col_mod = int(col.db.scalar("select mod from col") or 0)
+    except Exception:
+        return False
+    state = _INCOMING_IDX_STATE
+    if state.get("col") == id(col) and state.get("col_mod") == col_mod:
+        return True
+    try:
+        if state.get("col") != id(col):
+            rows = col.db.all(
+                "select id, flds, mod from notes where flds like '%|nid%' or flds like '%|cid%'"
+            )
+            note_mod = int(col.db.scalar("select max(mod) from notes") or 0)
+            _INCOMING_IDX.clear()
+            _INCOMING_SRC_LINKS.clear()
+        else:
+            note_mod = int(state.get("note_mod", 0))
+            rows = col.db.all("select id, flds, mod from notes where mod >= ?", note_mod)
+    except Exception:
+        return False
+    for src_nid_raw, flds, mod in rows:
+        try:
+            src_nid = int(src_nid_raw)
+            note_mod = max(note_mod, int(mod or 0))
+        except Exception:
+            continue
+        _index_note_links(src_nid, str(flds or ""))
+    state["col"] = id(col)
+    state["col_mod"] = col_mod
+    state["note_mod"] = note_mod
+    return True
+
+
+def _incoming_source_rows(kind: str, target: int, nid: int) -> list[tuple[int, str]]:
+    exclude = int(nid) if nid > 0 else -1
+    if _sync_incoming_index():
+        srcs = sorted(x for x in _INCOMING_IDX.get((kind, target), ()) if x != exclude)
+        if not srcs:
+            return []
+        placeholders = ",".join("?" for _ in srcs)
+        return mw.col.db.all(f"select id, flds from notes where id in ({placeholders})", *srcs)
+    like = f"%|{kind}{target}]%"
+    return mw.col.db.all(
+        "select id, flds from notes where id != ? and flds like ?",
+        exclude,
+        like,
+    )
+
+
 def _collect_incoming(nid: int, cid: int) -> list[tuple[int, ParsedLink]]:
+    nid = int(nid or 0)
+    cid = int(cid or 0)
     if not nid and not cid:
         return []
     if mw is None or not getattr(mw, "col", None):
@@ -542,32 +731,23 @@ def _collect_incoming(nid: int, cid: int) -> list[tuple[int, ParsedLink]]:
 
     queries: list[tuple[str, int]] = []
     if nid > 0:
-        queries.append(("nid", int(nid)))
+        queries.append(("nid", nid))
     if cid > 0:
-        queries.append(("cid", int(cid)))
+        queries.append(("cid", cid))
 
     seen: set[tuple[int, str, int, str]] = set()
     out: list[tuple[int, ParsedLink]] = []
     for kind, target in queries:
-        like = f"%|{kind}{target}]%"
         try:
-            rows = mw.col.db.all(
-                "select id, flds from notes where id != ? and flds like ?",
-                int(nid) if nid > 0 else -1,
-                like,
-            )
+            rows = _incoming_source_rows(kind, target, nid)
         except Exception:
             continue
-        for src_nid_raw, flds in rows:
-            try:
-                src_nid = int(src_nid_raw)
-            except Exception:
-                continue
+        for src_nid, flds in rows:
             for field_text in str(flds or "").split("\x1f"):
                 for ref in _parse_raw_links(field_text):
-                    if ref.kind != kind or int(ref.target_id) != target:
+                    if ref.kind != kind or ref.target_id != target:
                         continue
-                    key = (src_nid, ref.kind, int(ref.target_id), str(ref.label))
+                    key = (src_nid, ref.kind, ref.target_id, ref.label)
                     if key in seen:
                         continue
                     seen.add(key)
@@ -575,29 +755,45 @@ def _collect_incoming(nid: int, cid: int) -> list[tuple[int, ParsedLink]]:
     return out
 
 
+_EMPTY_ITEM_ROLE: dict[str, Any] = {
+    "open_nid": 0,
+    "link_kind": "",
+    "link_id": 0,
+    "bucket": "",
+    "is_header": False,
+}
+
+
+def _panel_item_role(row: PanelItem) -> dict[str, Any]:
+    return {
+        "open_nid": int(row.open_nid) if int(row.open_nid) > 0 else 0,
+        "link_kind": str(row.link_kind or "").lower(),
+        "link_id": int(row.link_id) if int(row.link_id) > 0 else 0,
+        "bucket": str(row.bucket or "").strip().lower(),
+        "is_header": bool(row.is_header),
+    }
+
+
 def _set_list_items(widget: QListWidget, values: list[PanelItem], empty_text: str) -> None:
+    # PanelItem is frozen, so an identical tuple means the list is already up to date.
+    values_key = (tuple(values), str(empty_text))
+    if getattr(widget, "_ajpc_last_values_key", None) == values_key:
+        return
+    widget._ajpc_last_values_key = values_key
     widget.clear()
+    nid_to_row: dict[int, int] = {}
+    widget._ajpc_nid_to_row = nid_to_row
     if not values:
         item = QListWidgetItem(empty_text)
-        item.setData(
-            Qt.ItemDataRole.UserRole,
-            {"open_nid": 0, "link_kind": "", "link_id": 0, "bucket": "", "is_header": False},
-        )
+        item.setData(Qt.ItemDataRole.UserRole, _EMPTY_ITEM_ROLE)
         item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEnabled)
         widget.addItem(item)
         return
-    for row in values:
+    for i, row in enumerate(values):
+        if row.open_nid > 0 and not row.is_header:
+            nid_to_row.setdefault(int(row.open_nid), i)
         item = QListWidgetItem(row.text)
-        item.setData(
-            Qt.ItemDataRole.UserRole,
-            {
-                "open_nid": int(row.open_nid) if int(row.open_nid) > 0 else 0,
-                "link_kind": str(row.link_kind or "").lower(),
-                "link_id": int(row.link_id) if int(row.link_id) > 0 else 0,
-                "bucket": str(row.bucket or "").strip().lower(),
-                "is_header": bool(row.is_header),
-            },
-        )
+        item.setData(Qt.ItemDataRole.UserRole, _panel_item_role(row))
         if not bool(row.clickable):
             item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEnabled)
         if bool(row.is_header):
@@ -621,6 +817,10 @@ def _apply_list_item_heights(widget: QListWidget, *, max_lines: int = 2) -> None
     fm = widget.fontMetrics()
     line_h = max(1, int(fm.lineSpacing()))
     wrap_flags = int(Qt.TextFlag.TextWordWrap | Qt.AlignmentFlag.AlignLeft)
+    max_lines = max(1, int(max_lines))
+    sep_h = max(6, int(line_h * 0.6))
+    header_h = max(line_h + 8, int(line_h * 1.35))
+    heights: dict[str, int] = {}
     for i in range(widget.count()):
         item = widget.item(i)
         if item is None:
@@ -629,17 +829,18 @@ def _apply_list_item_heights(widget: QListWidget, *, max_lines: int = 2) -> None
         open_nid, _kind, _link_id, _bucket, is_header = _item_meta(item)
         is_sep = (open_nid <= 0) and (not is_header) and text.strip("-").strip() == ""
         if is_sep:
-            h = max(6, int(line_h * 0.6))
-            item.setSizeHint(QSize(0, h))
+            item.setSizeHint(QSize(0, sep_h))
             continue
         if is_header:
-            h = max(line_h + 8, int(line_h * 1.35))
-            item.setSizeHint(QSize(0, h))
+            item.setSizeHint(QSize(0, header_h))
             continue
-        rect = fm.boundingRect(0, 0, avail_w, 2000, wrap_flags, text)
-        lines = max(1, int((rect.height() + line_h - 1) // line_h))
-        lines = min(max(1, int(max_lines)), lines)
-        h = max(line_h + 8, int(lines * line_h + 8))
+        h = heights.get(text)
+        if h is None:
+            rect = fm.boundingRect(0, 0, avail_w, 2000, wrap_flags, text)
+            lines = max(1, int((rect.height() + line_h - 1) // line_h))
+            lines = min(max_lines, lines)
+            h = max(line_h + 8, int(lines * line_h + 8))
+            heights[text] = h
         item.setSizeHint(QSize(0, h))
 
 
@@ -810,19 +1011,15 @@ def _select_item_by_nid(widget: QListWidget, nid: int) -> bool:
     target = int(nid or 0)
     if target <= 0:
         return False
-    for i in range(widget.count()):
-        item = widget.item(i)
-        if item is None:
-            continue
-        open_nid, _kind, _link_id, _bucket, is_header = _item_meta(item)
-        if is_header:
-            continue
-        if int(open_nid) != target:
-            continue
-        widget.setCurrentItem(item)
-        widget.scrollToItem(item)
-        return True
-    return False
+    row = getattr(widget, "_ajpc_nid_to_row", {}).get(target)
+    if row is None:
+        return False
+    item = widget.item(row)
+    if item is None:
+        return False
+    widget.setCurrentItem(item)
+    widget.scrollToItem(item)
+    return True
 
 
 def _sync_list_selection_from_graph(panel, nid: int) -> None:
@@ -869,49 +1066,39 @@ def _on_prio_needed_height(panel, height: int) -> None:
         fn(bool(getattr(panel, "_has_prio_data", False)), height=h)
 
 
-def _toggle_browser_graph_panel(editor: Editor) -> None:
-    browser = getattr(editor, "parentWindow", None)
-    if browser is None:
-        return
-    panel = getattr(browser, "_ajpc_browser_graph_panel", None)
-    if panel is None:
+def _get_panel(browser, *, attach: bool = False):
+    # The panel is stored in the instance dict by _attach_panel; read it directly.
+    try:
+        d = browser.__dict__
+    except AttributeError:
+        return getattr(browser, "_ajpc_browser_graph_panel", None)
+    panel = d.get("_ajpc_browser_graph_panel")
+    if panel is None and attach:
         _attach_panel(browser)
-        panel = getattr(browser, "_ajpc_browser_graph_panel", None)
-    if panel is None:
-        return
-    current = bool(getattr(panel, "_links_user_visible", True))
-    panel._links_user_visible = not current
-    _refresh_panel(browser)
+        panel = d.get("_ajpc_browser_graph_panel")
+    return panel
 
 
-def _toggle_browser_graph_canvas(editor: Editor) -> None:
+def _toggle_browser_graph_attr(editor: Editor, attr: str) -> None:
     browser = getattr(editor, "parentWindow", None)
     if browser is None:
         return
-    panel = getattr(browser, "_ajpc_browser_graph_panel", None)
-    if panel is None:
-        _attach_panel(browser)
-        panel = getattr(browser, "_ajpc_browser_graph_panel", None)
+    panel = _get_panel(browser, attach=True)
     if panel is None:
         return
-    current = bool(getattr(panel, "_graph_user_visible", True))
-    panel._graph_user_visible = not current
+    try:
+        current = bool(panel.__dict__[attr])
+    except (AttributeError, KeyError):
+        current = bool(getattr(panel, attr, True))
+    setattr(panel, attr, not current)
+    panel._ajpc_last_stamp = None
+    panel._last_refresh_key = None
     _refresh_panel(browser)
 
 
-def _toggle_browser_graph_prio(editor: Editor) -> None:
-    browser = getattr(editor, "parentWindow", None)
-    if browser is None:
-        return
-    panel = getattr(browser, "_ajpc_browser_graph_panel", None)
-    if panel is None:
-        _attach_panel(browser)
-        panel = getattr(browser, "_ajpc_browser_graph_panel", None)
-    if panel is None:
-        return
-    current = bool(getattr(panel, "_prio_user_visible", True))
-    panel._prio_user_visible = not current
-    _refresh_panel(browser)
+_toggle_browser_graph_panel = functools.partial(_toggle_browser_graph_attr, attr="_links_user_visible")
+_toggle_browser_graph_canvas = functools.partial(_toggle_browser_graph_attr, attr="_graph_user_visible")
+_toggle_browser_graph_prio = functools.partial(_toggle_browser_graph_attr, attr="_prio_user_visible")
 
 
 def _inject_editor_toggle_buttons(buttons: list[str], editor: Editor) -> None:
@@ -978,9 +1165,12 @@ def _sectioned_items(
     sections: list[tuple[str, str, list[PanelItem]]],
 ) -> list[PanelItem]:
     out: list[PanelItem] = []
-    present = [(title, bucket, items) for title, bucket, items in sections if items]
-    for _i, (title, bucket, items) in enumerate(present):
-        out.append(
+    append = out.append
+    extend = out.extend
+    for title, bucket, items in sections:
+        if not items:
+            continue
+        append(
             PanelItem(
                 text=title,
                 open_nid=0,
@@ -991,10 +1181,47 @@ def _sectioned_items(
                 clickable=True,
             )
         )
-        out.extend(items)
+        extend(items)
     return out
 
 
+def _ensure_graph_node(
+    nodes: dict[str, dict[str, Any]],
+    accent_by_nid: dict[int, str],
+    note_labels: dict[int, str],
+    id_by_nid: dict[int, str],
+    nid: int,
+    label: str,
+    bucket: str,
+) -> str | None:
+    # nid is already an int and label already a stripped str.
+    if nid <= 0:
+        return None
+    bucket = sys.intern(bucket or "manual")
+    node_id = id_by_nid.get(nid)
+    if node_id is None:
+        node_id = id_by_nid[nid] = f"n{nid}"
+    node = nodes.get(node_id)
+    if node is None:
+        nodes[node_id] = {
+            "id": node_id,
+            "nid": nid,
+            "label": label or note_labels.get(nid) or _note_label(nid),
+            "role": "linked",
+            "bucket": bucket,
+            "color": accent_by_nid.get(nid, ""),
+        }
+    elif bucket is _BUCKET_FAMILY_PRIO:
+        upgrade: dict[str, Any] = {"bucket": _BUCKET_FAMILY_PRIO}
+        if label:
+            upgrade["label"] = label
+        color = accent_by_nid.get(nid)
+        if color:
+            upgrade["color"] = color
+        node.update(upgrade)
+    return node_id
+
+
 def _build_force_graph_payload(
     current_nid: int,
     outgoing_manual: list[PanelItem],
@@ -1004,55 +1231,46 @@ def _build_force_graph_payload(
     family_prio_nodes: set[int],
     family_prio_edges: list[tuple[int, int]],
     family_prio_labels: dict[int, str],
+    note_labels: dict[int, str] | None = None,
+    accent_by_nid: dict[int, str] | None = None,
 ) -> dict[str, Any]:
+    note_labels = note_labels or {}
+    current_nid = int(current_nid)
     nodes: dict[str, dict[str, Any]] = {}
     edges: list[dict[str, Any]] = []
 
-    involved_nids: set[int] = {int(current_nid)}
-    involved_nids.update(int(it.open_nid) for it in outgoing_manual if int(it.open_nid) > 0)
-    involved_nids.update(int(it.open_nid) for it in outgoing_family if int(it.open_nid) > 0)
-    involved_nids.update(int(it.open_nid) for it in outgoing_mass if int(it.open_nid) > 0)
-    involved_nids.update(int(it.open_nid) for it in incoming_manual if int(it.open_nid) > 0)
-    involved_nids.update(int(x) for x in family_prio_nodes if int(x) > 0)
-    accent_by_nid = _accent_colors_for_nids(involved_nids)
-
-    cur_id = f"n{int(current_nid)}"
+    involved_list: list[int] = [current_nid]
+    for items in (outgoing_manual, outgoing_family, outgoing_mass, incoming_manual):
+        for it in items:
+            if it.open_nid > 0:
+                involved_list.append(it.open_nid)
+    involved_list.extend(x for x in family_prio_nodes if x > 0)
+    involved_nids: set[int] = set(involved_list)
+    if accent_by_nid is None:
+        accent_by_nid = _accent_colors_for_nids(involved_nids)
+    id_by_nid = {n: f"n{n}" for n in involved_nids}
+
+    cur_id = id_by_nid[current_nid]
     nodes[cur_id] = {
         "id": cur_id,
-        "nid": int(current_nid),
-        "label": _note_label(int(current_nid)),
+        "nid": current_nid,
+        "label": note_labels.get(current_nid) or _note_label(current_nid),
         "role": "current",
         "bucket": "manual",
-        "color": accent_by_nid.get(int(current_nid), ""),
+        "color": accent_by_nid.get(current_nid, ""),
     }
 
-    def _ensure(nid: int, label: str, bucket: str) -> str | None:
-        if int(nid) <= 0:
-            return None
-        node_id = f"n{int(nid)}"
-        if node_id not in nodes:
-            nodes[node_id] = {
-                "id": node_id,
-                "nid": int(nid),
-                "label": str(label or "").strip() or _note_label(int(nid)),
-                "role": "linked",
-                "bucket": str(bucket or "manual"),
-                "color": accent_by_nid.get(int(nid), ""),
-            }
-        elif str(bucket or "") == "family_prio":
-            nodes[node_id]["bucket"] = "family_prio"
-            if str(label or "").strip():
-                nodes[node_id]["label"] = str(label).strip()
-            if accent_by_nid.get(int(nid)):
-                nodes[node_id]["color"] = accent_by_nid.get(int(nid), "")
-        return node_id
+    def _coerced(items: list[PanelItem]) -> list[tuple[int, str, str]]:
+        return [
+            (int(it.open_nid or 0), str(it.text or "").strip(), str(it.link_kind or ""))
+            for it in items
+        ]
 
     def _add_out(items: list[PanelItem], bucket: str, skip_nids: set[int] | None = None) -> None:
-        for it in items:
-            nid = int(it.open_nid or 0)
+        for nid, text, link_kind in _coerced(items):
             if skip_nids and nid in skip_nids:
                 continue
-            target = _ensure(nid, str(it.text or ""), bucket)
+            target = _ensure_graph_node(nodes, accent_by_nid, note_labels, id_by_nid, nid, text, bucket)
             if not target:
                 continue
             edges.append(
@@ -1061,14 +1279,13 @@ def _build_force_graph_payload(
                     "target": target,
                     "bucket": bucket,
                     "direction": "outgoing",
-                    "kind": str(it.link_kind or ""),
+                    "kind": link_kind,
                 }
             )
 
     def _add_in(items: list[PanelItem], bucket: str) -> None:
-        for it in items:
-            nid = int(it.open_nid or 0)
-            source = _ensure(nid, str(it.text or ""), bucket)
+        for nid, text, link_kind in _coerced(items):
+            source = _ensure_graph_node(nodes, accent_by_nid, note_labels, id_by_nid, nid, text, bucket)
             if not source:
                 continue
             edges.append(
@@ -1077,17 +1294,17 @@ def _build_force_graph_payload(
                     "target": cur_id,
                     "bucket": bucket,
                     "direction": "incoming",
-                    "kind": str(it.link_kind or ""),
+                    "kind": link_kind,
                 }
             )
 
     _add_out(outgoing_manual, "manual")
     chain_edge_nids: set[int] = set()
     for src_nid, dst_nid in family_prio_edges:
-        if int(src_nid) > 0:
-            chain_edge_nids.add(int(src_nid))
-        if int(dst_nid) > 0:
-            chain_edge_nids.add(int(dst_nid))
+        if src_nid > 0:
+            chain_edge_nids.add(src_nid)
+        if dst_nid > 0:
+            chain_edge_nids.add(dst_nid)
     # Only suppress direct family edges when there is an actual prio chain edge.
     _add_out(
         outgoing_family,
@@ -1097,11 +1314,16 @@ def _build_force_graph_payload(
     _add_out(outgoing_mass, "mass")
     _add_in(incoming_manual, "manual")
 
+    prio_label = {nid: str(family_prio_labels.get(nid, "") or "").strip() for nid in family_prio_nodes}
     for nid in sorted(family_prio_nodes):
-        _ensure(int(nid), family_prio_labels.get(int(nid), ""), "family_prio")
+        _ensure_graph_node(nodes, accent_by_nid, note_labels, id_by_nid, nid, prio_label[nid], "family_prio")
     for src_nid, dst_nid in family_prio_edges:
-        src = _ensure(int(src_nid), family_prio_labels.get(int(src_nid), ""), "family_prio")
-        dst = _ensure(int(dst_nid), family_prio_labels.get(int(dst_nid), ""), "family_prio")
+        src = _ensure_graph_node(
+            nodes, accent_by_nid, note_labels, id_by_nid, src_nid, prio_label.get(src_nid, ""), "family_prio"
+        )
+        dst = _ensure_graph_node(
+            nodes, accent_by_nid, note_labels, id_by_nid, dst_nid, prio_label.get(dst_nid, ""), "family_prio"
+        )
         if not src or not dst:
             continue
         edges.append(
@@ -1126,29 +1348,98 @@ def _build_prio_chain_payload(
     family_prio_nodes: set[int],
     family_prio_edges: list[tuple[int, int]],
     family_prio_labels: dict[int, str],
+    note_labels: dict[int, str] | None = None,
+    accent_by_nid: dict[int, str] | None = None,
 ) -> dict[str, Any]:
+    note_labels = note_labels or {}
     if not family_prio_nodes or not family_prio_edges:
         return {"nodes": [], "edges": [], "current_nid": int(current_nid)}
     nids = {int(x) for x in family_prio_nodes if int(x) > 0}
-    colors = _accent_colors_for_nids(nids)
-    nodes: list[dict[str, Any]] = []
-    for nid in sorted(nids):
-        nodes.append(
-            {
-                "id": f"n{nid}",
-                "nid": int(nid),
-                "label": str(family_prio_labels.get(int(nid), "") or _note_label(int(nid))),
-                "color": str(colors.get(int(nid), "") or "#3d95e7"),
-            }
+    colors = accent_by_nid if accent_by_nid is not None else _accent_colors_for_nids(nids)
+    # Plain tuples first; the per-node dicts are only built for the JSON boundary.
+    node_rows = [
+        (
+            nid,
+            str(family_prio_labels.get(nid, "") or note_labels.get(nid) or _note_label(nid)),
+            str(colors.get(nid, "") or "#3d95e7"),
         )
-    edges: list[dict[str, Any]] = []
-    for src, dst in family_prio_edges:
-        s = int(src)
-        d = int(dst)
+        for nid in sorted(nids)
+    ]
+    edge_rows = [(s, d) for s, d in ((int(src), int(dst)) for src, dst in family_prio_edges) if s > 0 and d > 0]
+    id_by_nid = {nid: f"n{nid}" for nid in nids}
+    for s, d in edge_rows:
+        if s not in id_by_nid:
+            id_by_nid[s] = f"n{s}"
+        if d not in id_by_nid:
+            id_by_nid[d] = f"n{d}"
+    return {
+        "nodes": [
+            {"id": id_by_nid[nid], "nid": nid, "label": label, "color": color}
+            for nid, label, color in node_rows
+        ],
+        "edges": [{"source": id_by_nid[s], "target": id_by_nid[d]} for s, d in edge_rows],
+        "current_nid": int(current_nid),
+    }
+
+
+def _longest_path_depths(start: int, adj: dict[int, set[int]]) -> dict[int, int]:
+    # Longest distance from start over a DAG, via Kahn's order on the reachable subgraph.
+    reach: set[int] = {start}
+    stack = [start]
+    while stack:
+        n = stack.pop()
+        for m in adj.get(n, ()):
+            if m not in reach:
+                reach.add(m)
+                stack.append(m)
+    indeg = dict.fromkeys(reach, 0)
+    for n in reach:
+        for m in adj.get(n, ()):
+            indeg[m] += 1
+    dist: dict[int, int] = {start: 0}
+    q = deque(n for n in reach if indeg[n] == 0)
+    while q:
+        n = q.popleft()
+        base = dist.get(n)
+        for m in adj.get(n, ()):
+            if base is not None and base + 1 > dist.get(m, -1):
+                dist[m] = base + 1
+            indeg[m] -= 1
+            if indeg[m] == 0:
+                q.append(m)
+    return dist
+
+
+def _compute_depths(
+    cur: int,
+    edges: list[tuple[int, int]],
+    extra_nodes: Iterable[int] = (),
+) -> tuple[dict[int, int], dict[int, list[int]]]:
+    outs: defaultdict[int, set[int]] = defaultdict(set)
+    preds: defaultdict[int, set[int]] = defaultdict(set)
+    nodes: set[int] = {cur}
+    nodes_add = nodes.add
+    for src, dst in edges:
+        s, d = int(src), int(dst)
         if s <= 0 or d <= 0:
             continue
-        edges.append({"source": f"n{s}", "target": f"n{d}"})
-    return {"nodes": nodes, "edges": edges, "current_nid": int(current_nid)}
+        outs[s].add(d)
+        preds[d].add(s)
+        nodes_add(s)
+        nodes_add(d)
+    nodes.update({x for x in map(int, extra_nodes) if x > 0})
+
+    # Ancestors get negative depth, descendants positive; nodes caught in a
+    # cycle are left at row 0 instead of being re-enqueued forever.
+    depth: dict[int, int] = {n: -dist for n, dist in _longest_path_depths(cur, preds).items()}
+    for n, dist in _longest_path_depths(cur, outs).items():
+        if n not in depth or dist > 0:
+            depth[n] = dist
+
+    rows: dict[int, list[int]] = {}
+    for nid in nodes:
+        rows.setdefault(depth.get(nid, 0), []).append(nid)
+    return depth, rows
 
 
 def _prio_row_count(current_nid: int, edges: list[tuple[int, int]]) -> int:
@@ -1157,42 +1448,56 @@ def _prio_row_count(current_nid: int, edges: list[tuple[int, int]]) -> int:
         return 0
     if not edges:
         return 0
-    outs: dict[int, set[int]] = {}
-    preds: dict[int, set[int]] = {}
-    nodes: set[int] = {cur}
-    for src, dst in edges:
-        s = int(src)
-        d = int(dst)
-        if s <= 0 or d <= 0:
-            continue
-        outs.setdefault(s, set()).add(d)
-        preds.setdefault(d, set()).add(s)
-        nodes.add(s)
-        nodes.add(d)
-    if not nodes:
-        return 0
-    depth: dict[int, int] = {cur: 0}
-    q = [cur]
-    while q:
-        nid = int(q.pop(0))
-        base = int(depth.get(nid, 0))
-        for p in preds.get(nid, set()):
-            nd = base - 1
-            if p not in depth or nd < int(depth[p]):
-                depth[p] = nd
-                q.append(int(p))
-    q = [cur]
-    while q:
-        nid = int(q.pop(0))
-        base = int(depth.get(nid, 0))
-        for c in outs.get(nid, set()):
-            nd = base + 1
-            if c not in depth or nd > int(depth[c]):
-                depth[c] = nd
-                q.append(int(c))
-    if not depth:
-        return 0
-    return max(1, len(set(int(v) for v in depth.values())))
+    _depth, rows = _compute_depths(cur, edges)
+    return max(1, len(rows))
+
+
+# Per-char width heuristic for Latin-1, tuned to the prio canvas label font (11px sans-serif);
+# wider CJK glyphs are handled in _char_w/_text_w.
+_CHAR_W_TABLE: tuple[float, ...] = tuple(
+    7.2 if chr(i) in "MW@#%&" else 3.2 if chr(i) in "il.,'`:;!| " else 6.2 for i in range(256)
+)
+_CJK_EXTRA_W = 10.4 - 6.2
+
+
+@functools.lru_cache(maxsize=2048)
+def _char_w(ch: str) -> float:
+    c = ord(ch)
+    if c < 256:
+        return _CHAR_W_TABLE[c]
+    return 10.4 if c >= 0x2E80 else 6.2
+
+
+@functools.lru_cache(maxsize=2048)
+def _text_w(text: str) -> float:
+    s = str(text or "")
+    # Non Latin-1 chars become "?" (6.2); CJK ones get their extra width added after.
+    total = sum(map(_CHAR_W_TABLE.__getitem__, s.encode("latin-1", "replace")))
+    if not s.isascii():
+        total += _CJK_EXTRA_W * sum(1 for ch in s if ord(ch) >= 0x2E80)
+    return total
+
+
+def _pack_lane_heights(boxes: list[tuple[int, int]], min_gap: int, lane_w: int) -> list[int]:
+    # Greedy lane packing; the estimate only needs each lane's tallest box.
+    lane_hs: list[int] = []
+    lane_used = -1
+    lane_h = 0
+    for bw, bh in boxes:
+        if lane_used < 0:
+            lane_used = bw
+            lane_h = bh
+        elif lane_used + min_gap + bw > lane_w:
+            lane_hs.append(lane_h)
+            lane_used = bw
+            lane_h = bh
+        else:
+            lane_used += min_gap + bw
+            if bh > lane_h:
+                lane_h = bh
+    if lane_used >= 0:
+        lane_hs.append(lane_h)
+    return lane_hs
 
 
 def _estimate_prio_needed_height(
@@ -1201,51 +1506,37 @@ def _estimate_prio_needed_height(
     family_prio_edges: list[tuple[int, int]],
     family_prio_labels: dict[int, str],
     view_width: int,
+    note_labels: dict[int, str] | None = None,
 ) -> int:
+    note_labels = note_labels or {}
     cur = int(current_nid or 0)
     if cur <= 0 or not family_prio_edges:
         return 0
 
-    outs: dict[int, set[int]] = {}
-    preds: dict[int, set[int]] = {}
-    nodes: set[int] = {cur}
-    for src, dst in family_prio_edges:
-        s = int(src)
-        d = int(dst)
-        if s <= 0 or d <= 0:
-            continue
-        outs.setdefault(s, set()).add(d)
-        preds.setdefault(d, set()).add(s)
-        nodes.add(s)
-        nodes.add(d)
-    nodes.update(int(x) for x in family_prio_nodes if int(x) > 0)
-    if not nodes:
-        return 0
-
-    depth: dict[int, int] = {cur: 0}
-    q = [cur]
-    while q:
-        nid = int(q.pop(0))
-        base = int(depth.get(nid, 0))
-        for p in preds.get(nid, set()):
-            nd = base - 1
-            if p not in depth or nd < int(depth[p]):
-                depth[p] = nd
-                q.append(int(p))
-    q = [cur]
-    while q:
-        nid = int(q.pop(0))
-        base = int(depth.get(nid, 0))
-        for c in outs.get(nid, set()):
-            nd = base + 1
-            if c not in depth or nd > int(depth[c]):
-                depth[c] = nd
-                q.append(int(c))
-
-    rows: dict[int, list[int]] = {}
-    for nid in nodes:
-        d = int(depth.get(int(nid), 0))
-        rows.setdefault(d, []).append(int(nid))
+    edges = tuple((int(src), int(dst)) for src, dst in family_prio_edges)
+    nodes = tuple(sorted(int(x) for x in family_prio_nodes if int(x) > 0))
+    label_nids = {cur, *nodes}
+    label_nids.update(n for edge in edges for n in edge if n > 0)
+    label_items = tuple(
+        (nid, str(family_prio_labels.get(nid, "") or note_labels.get(nid) or _note_label(nid)))
+        for nid in sorted(label_nids)
+    )
+    # Resizes mostly hit the cache; flooring the width only errs towards more wrapping.
+    width_bucket = max(0, int(view_width)) // _PRIO_WIDTH_BUCKET
+    return _estimate_prio_height_cached(cur, edges, nodes, label_items, width_bucket)
+
+
+@functools.lru_cache(maxsize=64)
+def _estimate_prio_height_cached(
+    cur: int,
+    family_prio_edges: tuple[tuple[int, int], ...],
+    family_prio_nodes: tuple[int, ...],
+    label_items: tuple[tuple[int, str], ...],
+    width_bucket: int,
+) -> int:
+    labels = dict(label_items)
+    view_width = width_bucket * _PRIO_WIDTH_BUCKET
+    _depth, rows = _compute_depths(cur, list(family_prio_edges), family_prio_nodes)
     if not rows:
         return 0
 
@@ -1258,19 +1549,7 @@ def _estimate_prio_needed_height(
     single_line_node_h = int(line_h + pad_y * 2)
     min_row_gap = single_line_node_h
     usable_w = max(120, int(view_width) - 72)
-
-    def _char_w(ch: str) -> float:
-        c = ord(ch) if ch else 0
-        if c >= 0x2E80:
-            return 10.4
-        if ch in "MW@#%&":
-            return 7.2
-        if ch in "il.,'`:;!| ":
-            return 3.2
-        return 6.2
-
-    def _text_w(text: str) -> float:
-        return sum(_char_w(ch) for ch in str(text or ""))
+    wrap_cache: dict[tuple[str, int], tuple[int, int]] = {}
 
     def _wrap_text(text: str, max_w: int, max_lines_in: int) -> list[str]:
         chars = list(str(text or "Node"))
@@ -1278,13 +1557,17 @@ def _estimate_prio_needed_height(
             return ["Node"]
         lines: list[str] = []
         cur = ""
+        cur_w = 0.0
+        limit = float(max_w)
         for ch in chars:
-            nxt = cur + ch
-            if _text_w(nxt) <= float(max_w) or not cur:
-                cur = nxt
+            ch_w = _char_w(ch)
+            if cur_w + ch_w <= limit or not cur:
+                cur += ch
+                cur_w += ch_w
             else:
                 lines.append(cur)
                 cur = ch
+                cur_w = ch_w
                 if len(lines) >= int(max_lines_in):
                     break
         if cur and len(lines) < int(max_lines_in):
@@ -1295,23 +1578,6 @@ def _estimate_prio_needed_height(
                 lines[max_lines_in - 1] = ln[:-1] + "..."
         return lines or ["Node"]
 
-    def _pack_lanes(boxes: list[tuple[int, int]], min_gap: int, lane_w: int) -> list[list[tuple[int, int]]]:
-        lanes: list[list[tuple[int, int]]] = []
-        lane: list[tuple[int, int]] = []
-        lane_used = 0
-        for bw, bh in boxes:
-            need = (min_gap + int(bw)) if lane else int(bw)
-            if lane and (lane_used + need) > lane_w:
-                lanes.append(lane)
-                lane = [(int(bw), int(bh))]
-                lane_used = int(bw)
-            else:
-                lane.append((int(bw), int(bh)))
-                lane_used += need
-        if lane:
-            lanes.append(lane)
-        return lanes
-
     total_rows_h = 0
     for d in sorted(rows.keys()):
         items = rows.get(d, [])
@@ -1331,28 +1597,33 @@ def _estimate_prio_needed_height(
         def _row_boxes(label_max_w: int) -> list[tuple[int, int]]:
             out: list[tuple[int, int]] = []
             for nid in items:
-                label = str(family_prio_labels.get(int(nid), "") or _note_label(int(nid)))
-                lines = _wrap_text(label, int(label_max_w), max_lines)
-                text_w = 0.0
-                for line in lines:
-                    text_w = max(text_w, _text_w(line))
-                box_w = max(48, int(round(text_w + (pad_x * 2))))
-                box_h = max(22, int(round((len(lines) * line_h) + (pad_y * 2))))
-                out.append((box_w, box_h))
+                label = labels.get(nid) or str(nid)
+                key = (label, int(label_max_w))
+                box = wrap_cache.get(key)
+                if box is None:
+                    lines = _wrap_text(label, int(label_max_w), max_lines)
+                    text_w = 0.0
+                    for line in lines:
+                        text_w = max(text_w, _text_w(line))
+                    box_w = max(48, int(round(text_w + (pad_x * 2))))
+                    box_h = max(22, int(round((len(lines) * line_h) + (pad_y * 2))))
+                    box = (box_w, box_h)
+                    wrap_cache[key] = box
+                out.append(box)
             return out
 
         dims = _row_boxes(max_label_w)
-        lanes = _pack_lanes(dims, min_gap, usable_w)
+        lane_hs = _pack_lane_heights(dims, min_gap, usable_w)
 
-        if len(lanes) > 1:
+        if len(lane_hs) > 1:
+            lanes_n = len(lane_hs)
             max_label_w = max(
                 24,
-                int((usable_w - (min_gap * max(0, n - 1))) / max(1, (n + len(lanes) - 1) // len(lanes)) - (pad_x * 2)),
+                int((usable_w - (min_gap * max(0, n - 1))) / max(1, (n + lanes_n - 1) // lanes_n) - (pad_x * 2)),
             )
             dims = _row_boxes(max_label_w)
-            lanes = _pack_lanes(dims, min_gap, usable_w)
+            lane_hs = _pack_lane_heights(dims, min_gap, usable_w)
 
-        lane_hs = [max((h for _w, h in lane), default=22) for lane in lanes]
         row_h = sum(lane_hs) + lane_gap * max(0, len(lane_hs) - 1)
         total_rows_h += int(max(22, row_h))
 
@@ -1371,11 +1642,37 @@ def _apply_prio_visibility(panel, *, has_data: bool, height: int | None = None)
         pv.setVisible(bool(has_data))
 
 
+def _notetypes_mtime() -> int:
+    # Accent colors come from note-type CSS, and editing it bumps neither notes.mod nor col.mod.
+    try:
+        return int(mw.col.db.scalar("select max(mtime_secs) from notetypes") or 0)
+    except Exception:
+        return 0
+
+
+def _refresh_stamp(nid: int, cid: int) -> tuple[Any, ...] | None:
+    try:
+        note_mod = int(mw.col.db.scalar("select mod from notes where id = ?", int(nid)) or 0)
+        col_mod = int(mw.col.db.scalar("select mod from col") or 0)
+    except Exception:
+        return None
+    return (
+        int(nid),
+        int(cid),
+        note_mod,
+        col_mod,
+        _notetypes_mtime(),
+        tuple(getattr(link_core, "_PROVIDERS", {}) or ()),
+    )
+
+
 def _refresh_panel(browser) -> None:
-    panel = getattr(browser, "_ajpc_browser_graph_panel", None)
+    panel = _get_panel(browser)
     if panel is None:
         return
     if mw is None or not getattr(mw, "col", None):
+        panel._ajpc_last_stamp = None
+        panel._last_refresh_key = None
         panel.outgoing_count.setText("Outgoing (0)")
         panel.incoming_count.setText("Incoming (0)")
         _set_list_items(panel.outgoing_list, [], "No links")
@@ -1392,8 +1689,9 @@ def _refresh_panel(browser) -> None:
 
     nid = _current_nid(browser)
     cid = _current_cid(browser)
-    card = _current_card(browser)
     if nid <= 0:
+        panel._ajpc_last_stamp = None
+        panel._last_refresh_key = None
         panel.outgoing_count.setText("Outgoing (0)")
         panel.incoming_count.setText("Incoming (0)")
         _set_list_items(panel.outgoing_list, [], "Select one card")
@@ -1408,6 +1706,23 @@ def _refresh_panel(browser) -> None:
             pass
         return
 
+    # Every pane toggled off: nothing to render; the toggle that shows one again refreshes.
+    if not (panel._links_user_visible or panel._prio_user_visible or panel._graph_user_visible):
+        panel._ajpc_last_stamp = None
+        panel._last_refresh_key = None
+        return
+
+    # Same note/card and nothing written to the collection since the last render.
+    stamp = _refresh_stamp(nid, cid)
+    if stamp is not None and stamp == getattr(panel, "_ajpc_last_stamp", None):
+        try:
+            panel.graph_view.clear_highlight()
+        except Exception:
+            pass
+        return
+    panel._ajpc_last_stamp = stamp
+
+    card = _current_card(browser)
     manual_outgoing = _collect_manual_outgoing(nid)
     auto_outgoing = _collect_auto_outgoing(card, manual_outgoing)
     incoming = _collect_incoming(nid, cid)
@@ -1435,15 +1750,18 @@ def _refresh_panel(browser) -> None:
     outgoing_manual: list[PanelItem] = [_out_item(ref, "manual") for ref in manual_outgoing]
     outgoing_family: list[PanelItem] = []
     outgoing_mass: list[PanelItem] = []
+    family_append = outgoing_family.append
+    mass_append = outgoing_mass.append
     for cat, ref in auto_outgoing:
         if cat == "family":
-            outgoing_family.append(_out_item(ref, "family"))
+            family_append(_out_item(ref, "family"))
         elif cat == "mass":
-            outgoing_mass.append(_out_item(ref, "mass"))
+            mass_append(_out_item(ref, "mass"))
 
     incoming_manual: list[PanelItem] = []
+    incoming_append = incoming_manual.append
     for src_nid, ref in incoming:
-        incoming_manual.append(
+        incoming_append(
             PanelItem(
                 text=_label_from_ref(ref),
                 open_nid=int(src_nid),
@@ -1455,8 +1773,35 @@ def _refresh_panel(browser) -> None:
 
     family_prio_nodes, family_prio_edges, family_prio_labels = _family_prio_chain(int(nid))
 
+    # One batched sfld lookup for every node the payload builders may label.
+    label_nids: set[int] = {int(nid)} | set(family_prio_nodes)
+    for items in (outgoing_manual, outgoing_family, outgoing_mass, incoming_manual):
+        label_nids.update(it.open_nid for it in items if it.open_nid > 0)
+    note_bulk = _note_bulk(label_nids)
+    note_labels = {n: label for n, (label, _mid) in note_bulk.items()}
+    # Both payload builders color from the same union of nodes.
+    accent_by_nid = _accent_colors_for_nids(label_nids, note_bulk)
+
+    # The collection changed, but maybe not anything this panel shows.
+    refresh_key = (
+        int(nid),
+        int(cid),
+        tuple(manual_outgoing),
+        tuple(auto_outgoing),
+        tuple(incoming),
+        tuple(family_prio_edges),
+        tuple(sorted(family_prio_labels.items())),
+        tuple(sorted(note_labels.items())),
+        tuple(sorted(accent_by_nid.items())),
+    )
+    if refresh_key == getattr(panel, "_last_refresh_key", None):
+        return
+    panel._last_refresh_key = refresh_key
+
     outgoing_total = len(outgoing_manual) + len(outgoing_family) + len(outgoing_mass)
     incoming_total = len(incoming_manual)
+    prio_view = panel.prio_view
+    graph_view = panel.graph_view
 
     panel.outgoing_count.setText(f"Outgoing ({outgoing_total})")
     panel.incoming_count.setText(f"Incoming ({incoming_total})")
@@ -1477,41 +1822,50 @@ def _refresh_panel(browser) -> None:
         _sectioned_items([("Manual Links", "manual", incoming_manual)]),
         "No incoming links",
     )
+    # Hidden panes are repopulated by the toggle that shows them again.
     try:
-        prio_payload = _build_prio_chain_payload(
-            int(nid),
-            family_prio_nodes,
-            family_prio_edges,
-            family_prio_labels,
-        )
-        panel.prio_view.set_data(
-            prio_payload
-        )
-        prio_need_h = _estimate_prio_needed_height(
-            int(nid),
-            family_prio_nodes,
-            family_prio_edges,
-            family_prio_labels,
-            int(panel.splitter.width()),
-        )
-        _apply_prio_visibility(
-            panel,
-            has_data=bool((prio_payload.get("nodes") or []) and (prio_payload.get("edges") or [])),
-            height=prio_need_h,
-        )
-        panel.graph_view.set_data(
-            _build_force_graph_payload(
+        has_prio_data = bool(family_prio_nodes and family_prio_edges)
+        if panel._prio_user_visible:
+            prio_payload = _build_prio_chain_payload(
                 int(nid),
-                outgoing_manual,
-                outgoing_family,
-                outgoing_mass,
-                incoming_manual,
                 family_prio_nodes,
                 family_prio_edges,
                 family_prio_labels,
+                note_labels,
+                accent_by_nid,
             )
-        )
-        panel.graph_view.clear_highlight()
+            prio_view.set_data(prio_payload)
+            prio_need_h = _estimate_prio_needed_height(
+                int(nid),
+                family_prio_nodes,
+                family_prio_edges,
+                family_prio_labels,
+                int(panel.splitter.width()),
+                note_labels,
+            )
+            _apply_prio_visibility(
+                panel,
+                has_data=bool((prio_payload.get("nodes") or []) and (prio_payload.get("edges") or [])),
+                height=prio_need_h,
+            )
+        else:
+            _apply_prio_visibility(panel, has_data=has_prio_data)
+        if panel._graph_user_visible:
+            graph_view.set_data(
+                _build_force_graph_payload(
+                    int(nid),
+                    outgoing_manual,
+                    outgoing_family,
+                    outgoing_mass,
+                    incoming_manual,
+                    family_prio_nodes,
+                    family_prio_edges,
+                    family_prio_labels,
+                    note_labels,
+                    accent_by_nid,
+                )
+            )
+            graph_view.clear_highlight()
     except Exception:
         pass
 
@@ -1534,6 +1888,24 @@ class _BrowserGraphPanel(QWidget):
         self._has_prio_data = False
         self._prio_needed_height = 130
         self._initial_width_applied = False
+        self._ajpc_last_stamp = None
+        self._last_refresh_key = None
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(16)
+        self._resize_timer.timeout.connect(self._on_resize_settled)
+        self._row_h_cache: dict[int, int] = {}
+        self._frame_w: dict[int, int] = {}
+        self._outgoing_label_h: int | None = None
+        self._incoming_label_h: int | None = None
+        self._last_reflow_key: tuple[Any, ...] | None = None
+        self._last_reflow_sizes: list[int] | None = None
+        self._browser_ref: Any = None
+        # Arrow-key scrolling fires did_change_row per row; only the row it settles on is rendered.
+        self._row_refresh_timer = QTimer(self)
+        self._row_refresh_timer.setSingleShot(True)
+        self._row_refresh_timer.setInterval(_ROW_REFRESH_DELAY_MS)
+        self._row_refresh_timer.timeout.connect(self._refresh_owner)
 
         root = QVBoxLayout(self)
         root.setContentsMargins(8, 0, 0, 0)
@@ -1586,6 +1958,13 @@ class _BrowserGraphPanel(QWidget):
         )
         self.links_layout.addWidget(self.incoming_count)
         self.links_layout.addWidget(self.incoming_list, 1)
+        for w in (self.outgoing_list, self.incoming_list):
+            w.installEventFilter(self)
+            model = w.model()
+            # Repopulating invalidates the cached row height; the rows' own setSizeHint calls
+            # (dataChanged) follow every insert, so listening to them would defeat the cache.
+            for sig in (model.modelReset, model.rowsInserted, model.rowsRemoved):
+                sig.connect(lambda *_args, k=id(w): self._row_h_cache.pop(k, None))
 
         self.prio_view = PrioChainView(self.splitter)
         self.prio_view.set_open_editor_handler(_open_note_editor)
@@ -1615,11 +1994,23 @@ class _BrowserGraphPanel(QWidget):
             self._resize_handle.raise_()
         except Exception:
             pass
+        self._reflow_sections()
+        # Row heights and the canvas background are settled once per frame, not per pixel.
+        self._resize_timer.start()
+        super().resizeEvent(event)
+
+    def _refresh_owner(self) -> None:
+        browser = self._browser_ref() if self._browser_ref is not None else None
+        if browser is not None:
+            _refresh_panel(browser)
+
+    def _on_resize_settled(self) -> None:
         self._sync_canvas_bg_to_list_alt()
         _apply_list_item_heights(self.outgoing_list, max_lines=2)
         _apply_list_item_heights(self.incoming_list, max_lines=2)
+        # A new width re-wraps the rows, so their heights were just re-hinted.
+        self._row_h_cache.clear()
         self._reflow_sections()
-        super().resizeEvent(event)
 
     def _begin_resize(self, global_x: int) -> None:
         self._resize_drag_active = True
@@ -1718,16 +2109,47 @@ class _BrowserGraphPanel(QWidget):
         except Exception:
             pass
 
-    def _list_widget_content_height(self, widget: QListWidget) -> int:
+    def changeEvent(self, event) -> None:
         try:
-            count = int(widget.count())
+            if event.type() in (QEvent.Type.FontChange, QEvent.Type.StyleChange):
+                self._row_h_cache.clear()
+                self._frame_w.clear()
+                self._outgoing_label_h = None
+                self._incoming_label_h = None
         except Exception:
-            count = 0
-        if count <= 0:
-            return int(widget.frameWidth() * 2)
+            pass
+        super().changeEvent(event)
+
+    def eventFilter(self, obj, event) -> bool:
+        try:
+            if event.type() in (
+                QEvent.Type.FontChange,
+                QEvent.Type.StyleChange,
+                QEvent.Type.ApplicationFontChange,
+            ):
+                self._row_h_cache.pop(id(obj), None)
+                self._frame_w.pop(id(obj), None)
+        except Exception:
+            pass
+        return super().eventFilter(obj, event)
+
+    def _cached_frame_w(self, widget: QListWidget) -> int:
+        key = id(widget)
+        frame_w = self._frame_w.get(key)
+        if frame_w is None:
+            frame_w = int(widget.frameWidth())
+            self._frame_w[key] = frame_w
+        return frame_w
+
+    def _row_height(self, widget: QListWidget) -> int:
+        key = id(widget)
+        row_h = self._row_h_cache.get(key)
+        if row_h is not None:
+            return row_h
         row_h = 0
         try:
-            row_h = int(widget.sizeHintForRow(0))
+            if widget.count() > 0:
+                row_h = int(widget.sizeHintForRow(0))
         except Exception:
             row_h = 0
         if row_h <= 0:
@@ -1735,23 +2157,34 @@ class _BrowserGraphPanel(QWidget):
                 row_h = int(widget.fontMetrics().height() + 8)
             except Exception:
                 row_h = 20
-        return int((widget.frameWidth() * 2) + (count * row_h) + 2)
+        self._row_h_cache[key] = row_h
+        return row_h
+
+    def _list_widget_content_height(self, widget: QListWidget) -> int:
+        try:
+            count = int(widget.count())
+        except Exception:
+            count = 0
+        if count <= 0:
+            return int(self._cached_frame_w(widget) * 2)
+        return int((self._cached_frame_w(widget) * 2) + (count * self._row_height(widget)) + 2)
 
     def _links_needed_height(self) -> int:
         has_out = self._outgoing_items > 0
         has_in = self._incoming_items > 0
         if not (has_out or has_in):
             return 0
-        widgets_visible = 0
+        # Header label heights only depend on font/style, not on the count in their text.
+        if self._outgoing_label_h is None:
+            self._outgoing_label_h = int(self.outgoing_count.sizeHint().height())
+        if self._incoming_label_h is None:
+            self._incoming_label_h = int(self.incoming_count.sizeHint().height())
+        widgets_visible = 2 * has_out + 2 * has_in
         needed = 0
         if has_out:
-            widgets_visible += 2
-            needed += int(self.outgoing_count.sizeHint().height())
-            needed += self._list_widget_content_height(self.outgoing_list)
+            needed += self._outgoing_label_h + self._list_widget_content_height(self.outgoing_list)
         if has_in:
-            widgets_visible += 2
-            needed += int(self.incoming_count.sizeHint().height())
-            needed += self._list_widget_content_height(self.incoming_list)
+            needed += self._incoming_label_h + self._list_widget_content_height(self.incoming_list)
         spacing = int(self.links_layout.spacing())
         if widgets_visible > 1 and spacing > 0:
             needed += spacing * (widgets_visible - 1)
@@ -1762,18 +2195,7 @@ class _BrowserGraphPanel(QWidget):
         for w in (self.outgoing_list, self.incoming_list):
             if not bool(w.isVisible()):
                 continue
-            h = 0
-            try:
-                if w.count() > 0:
-                    h = int(w.sizeHintForRow(0))
-            except Exception:
-                h = 0
-            if h <= 0:
-                try:
-                    h = int(w.fontMetrics().height() + 8)
-                except Exception:
-                    h = 20
-            heights.append(max(1, int(h)))
+            heights.append(max(1, self._row_height(w)))
         if not heights:
             return 20
         return int(max(heights))
@@ -1796,6 +2218,26 @@ class _BrowserGraphPanel(QWidget):
         gap_visible = bool(links_visible and graph_visible and not prio_visible)
         self.section_gap.setVisible(gap_visible)
 
+        all_three = bool(links_visible and prio_visible and graph_visible)
+        list_needed = self._links_needed_height() if all_three else 0
+        row_h = self._links_row_height() if all_three else 0
+        # Drag-resizes deliver a resizeEvent per pixel; most of them change nothing below.
+        reflow_key = (
+            splitter_h,
+            splitter_w,
+            links_visible,
+            prio_visible,
+            graph_visible,
+            int(self._prio_needed_height),
+            list_needed,
+            row_h,
+        )
+        # Compare against the splitter's live sizes: a user drag since the last reflow must snap back.
+        current = list(self.splitter.sizes())
+        if reflow_key == self._last_reflow_key and current == self._last_reflow_sizes:
+            return
+        self._last_reflow_key = reflow_key
+
         gap_h = 5 if gap_visible else 0
         deps_h = int(self._prio_needed_height) if prio_visible else 0
         if prio_visible:
@@ -1809,13 +2251,11 @@ class _BrowserGraphPanel(QWidget):
         list_h = 0
         graph_h = 0
 
-        all_three = bool(links_visible and prio_visible and graph_visible)
         if all_three:
             # Preferred mode trigger: there is enough room for lists under the 50% graph gate.
             graph_50 = min(int(splitter_w), int(avail / 2))
             list_for_50 = max(0, avail - graph_50)
-            list_needed = self._links_needed_height()
-            two_blank_rows = 2 * self._links_row_height()
+            two_blank_rows = 2 * row_h
             list_target = max(0, int(list_needed + two_blank_rows))
             if list_needed > 0 and list_for_50 >= list_target and list_target <= avail:
                 # New rule: list gets exact needed height + 2 blank rows, graph gets the rest.
@@ -1867,7 +2307,10 @@ class _BrowserGraphPanel(QWidget):
                 sizes[1] += rem
             elif gap_visible:
                 sizes[2] += rem
-        self.splitter.setSizes(sizes)
+        if sizes != current:
+            self.splitter.setSizes(sizes)
+            current = list(self.splitter.sizes())
+        self._last_reflow_sizes = current
 
 
 class _PanelResizeHandle(QWidget):
@@ -1900,7 +2343,7 @@ class _PanelResizeHandle(QWidget):
 
 
 def _attach_panel(browser) -> None:
-    if getattr(browser, "_ajpc_browser_graph_panel", None) is not None:
+    if _get_panel(browser) is not None:
         return
     form = getattr(browser, "form", None)
     if form is None:
@@ -1911,6 +2354,7 @@ def _attach_panel(browser) -> None:
     panel = _BrowserGraphPanel(form.verticalLayoutWidget)
     row_layout.addWidget(panel)
     browser._ajpc_browser_graph_panel = panel
+    panel._browser_ref = weakref.ref(browser)
     _BROWSERS.add(browser)
     _apply_initial_sidebar_width(browser)
     try:
@@ -1921,7 +2365,7 @@ def _attach_panel(browser) -> None:
 
 
 def _apply_initial_sidebar_width(browser) -> None:
-    panel = getattr(browser, "_ajpc_browser_graph_panel", None)
+    panel = _get_panel(browser)
     if panel is None:
         return
     try:
@@ -1955,38 +2399,70 @@ def _on_browser_will_show(browser) -> None:
 
 
 def _on_browser_did_change_row(browser) -> None:
-    _refresh_panel(browser)
+    panel = _get_panel(browser)
+    timer = getattr(panel, "_row_refresh_timer", None) if panel is not None else None
+    if timer is None:
+        _refresh_panel(browser)
+        return
+    timer.start()
 
 
 def _changes_matter_for_links(changes: Any) -> bool:
     if changes is None:
         return True
-    for flag in (
-        "note_text",
-        "note",
-        "card",
-        "tags",
-        "deck",
-        "notetype",
-        "browser_table",
-    ):
+    return any(getattr(changes, flag, False) for flag in _LINK_RELEVANT_FLAGS)
+
+
+def _flush_pending_refresh() -> None:
+    global _REFRESH_FLUSH_SCHEDULED
+    _REFRESH_FLUSH_SCHEDULED = False
+    pending = list(_PENDING_REFRESH)
+    _PENDING_REFRESH.clear()
+    for browser in pending:
         try:
-            if bool(getattr(changes, flag, False)):
-                return True
+            if _get_panel(browser) is not None:
+                _refresh_panel(browser)
         except Exception:
             continue
-    return False
 
 
-def _on_operation_did_execute(changes, _handler) -> None:
-    if not _changes_matter_for_links(changes):
+def _on_add_cards_did_add_note(note) -> None:
+    _index_live_note(note)
+
+
+def _on_sync_did_finish() -> None:
+    _drop_incoming_index()
+
+
+def _changes_may_keep_old_mod(changes: Any) -> bool:
+    # A full reset, or note text changed together with decks/note types, as an .apkg import
+    # does. Adds, edits and find/replace stamp a fresh mod, which the rescan picks up.
+    if changes is None:
+        return True
+    if not getattr(changes, "note_text", False):
+        return False
+    return bool(getattr(changes, "notetype", False) or getattr(changes, "deck", False))
+
+
+def _on_operation_did_execute(changes, handler) -> None:
+    global _REFRESH_FLUSH_SCHEDULED
+    if _changes_may_keep_old_mod(changes):
+        _drop_incoming_index()
+    elif isinstance(handler, Editor) and getattr(changes, "note_text", False):
+        _index_live_note(getattr(handler, "note", None))
+    if not _BROWSERS or not _changes_matter_for_links(changes):
         return
     for browser in list(_BROWSERS):
-        try:
-            if getattr(browser, "_ajpc_browser_graph_panel", None) is not None:
-                _refresh_panel(browser)
-        except Exception:
-            continue
+        if _get_panel(browser) is not None:
+            _PENDING_REFRESH.add(browser)
+    if not _PENDING_REFRESH or _REFRESH_FLUSH_SCHEDULED:
+        return
+    # Bulk ops and sync fire this in bursts; refresh each browser once on the next loop turn.
+    try:
+        QTimer.singleShot(0, _flush_pending_refresh)
+        _REFRESH_FLUSH_SCHEDULED = True
+    except Exception:
+        _flush_pending_refresh()
 
 
 def _install() -> None:
@@ -1997,6 +2473,8 @@ def _install() -> None:
     gui_hooks.browser_will_show.append(_on_browser_will_show)
     gui_hooks.browser_did_change_row.append(_on_browser_did_change_row)
     gui_hooks.operation_did_execute.append(_on_operation_did_execute)
+    gui_hooks.add_cards_did_add_note.append(_on_add_cards_did_add_note)
+    gui_hooks.sync_did_finish.append(_on_sync_did_finish)
     gui_hooks.editor_did_init_buttons.append(_inject_editor_toggle_buttons)
     mw._ajpc_browser_graph_installed = True
 
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import bisect
+import copy
 import json
 import os
-import re
 import time
 import traceback
+from dataclasses import dataclass
 from typing import Any
 
 from anki.collection import Collection
@@ -27,6 +29,7 @@ from aqt.qt import (
 from aqt.utils import askUser, tooltip
 
 from .. import logging as core_logging
+from ..ui.settings_common import _parse_list_entries
 from . import ModuleSpec
 
 ADDON_DIR = os.path.dirname(os.path.dirname(__file__))
@@ -44,12 +47,45 @@ CARD_SORTER_EXCLUDE_DECKS: list[str] = []
 CARD_SORTER_EXCLUDE_TAGS: list[str] = []
 CARD_SORTER_NOTE_TYPES: dict[str, Any] = {}
 
+_CFG_CACHE: tuple[tuple[int, int], dict[str, Any]] | None = None
+_CFG_STAMP: tuple[Any, ...] | None = None
 
-def _load_config() -> dict[str, Any]:
-    if not os.path.exists(CONFIG_PATH):
-        return {}
+
+def _read_config() -> tuple[tuple[int, int], dict[str, Any]]:
+    global _CFG_CACHE
+    try:
+        st = os.stat(CONFIG_PATH)
+    except OSError:
+        _CFG_CACHE = None
+        return (0, 0), {}
+    # sort_note reloads on every added note; only re-parse when config.json was rewritten.
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _CFG_CACHE
+    if cached is not None and cached[0] == key:
+        return cached
     with open(CONFIG_PATH, "r", encoding="utf-8-sig") as f:
-        return json.load(f)
+        cfg = json.load(f)
+    _CFG_CACHE = (key, cfg)
+    return _CFG_CACHE
+
+
+def _load_config() -> dict[str, Any]:
+    # The cached parse is shared; hand out a copy callers may mutate.
+    return copy.deepcopy(_read_config()[1])
+
+
+def _note_types_stamp(col) -> tuple[int, int]:
+    # Adding or renaming a note type changes what configured names resolve to.
+    try:
+        row = col.db.first("select count(), max(mtime_secs) from notetypes")
+        if row:
+            return (int(row[0] or 0), int(row[1] or 0))
+    except Exception:
+        pass
+    try:
+        return (-1, int(col.db.scalar("select mod from col") or 0))
+    except Exception:
+        return (-1, 0)
 
 
 def cfg_get(path: str, default: Any = None) -> Any:
@@ -73,13 +109,30 @@ def _cfg_set(cfg: dict[str, Any], path: str, value: Any) -> None:
     cur[parts[-1]] = value
 
 
-def reload_config() -> None:
+def reload_config(force: bool = False) -> None:
     global CFG, DEBUG, RUN_ON_SYNC, RUN_ON_UI
     global CARD_SORTER_ENABLED, CARD_SORTER_RUN_ON_ADD
     global CARD_SORTER_RUN_ON_SYNC
     global CARD_SORTER_EXCLUDE_DECKS, CARD_SORTER_EXCLUDE_TAGS, CARD_SORTER_NOTE_TYPES
+    global _CFG_CACHE, _CFG_STAMP
 
-    CFG = _load_config()
+    if force:
+        _CFG_CACHE = None
+        _CFG_STAMP = None
+    file_key, parsed = _read_config()
+
+    try:
+        from aqt import mw  # type: ignore
+    except Exception:
+        mw = None  # type: ignore
+
+    cur_col = mw.col if mw is not None and getattr(mw, "col", None) else None
+    stamp = (file_key, id(cur_col), _note_types_stamp(cur_col) if cur_col is not None else None)
+    # Same file against the same note types: everything derived below is already current.
+    if stamp == _CFG_STAMP:
+        return
+    CFG = copy.deepcopy(parsed)
+    _CFG_STAMP = stamp
 
     _dbg = CFG.get("debug", {})
     if isinstance(_dbg, dict):
@@ -97,12 +150,24 @@ def reload_config() -> None:
     CARD_SORTER_EXCLUDE_TAGS = list(cfg_get("card_sorter.exclude_tags", []) or [])
     CARD_SORTER_NOTE_TYPES = cfg_get("card_sorter.note_types", {}) or {}
 
-    try:
-        from aqt import mw  # type: ignore
-    except Exception:
-        mw = None  # type: ignore
+    name_to_id: dict[str, str] | None = None
+
+    def _model_name_map(col) -> dict[str, str]:
+        # One pass over the note types instead of a by_name scan per configured name.
+        out: dict[str, str] = {}
+        try:
+            for entry in col.models.all_names_and_ids():
+                out.setdefault(str(entry.name), str(int(entry.id)))
+        except Exception:
+            try:
+                for model in col.models.all():
+                    out.setdefault(str(model.get("name")), str(int(model.get("id"))))
+            except Exception:
+                pass
+        return out
 
     def _note_type_id_from_ident(col, ident: Any) -> str:
+        nonlocal name_to_id
         if ident is None:
             return ""
         s = str(ident).strip()
@@ -114,16 +179,9 @@ def reload_config() -> None:
             except Exception:
                 return ""
             return str(mid)
-        try:
-            model = col.models.by_name(s)
-        except Exception:
-            model = None
-        if not model:
-            return s
-        try:
-            return str(int(model.get("id")))
-        except Exception:
-            return s
+        if name_to_id is None:
+            name_to_id = _model_name_map(col)
+        return name_to_id.get(s, s)
 
     def _map_dict_keys(col, raw: dict[str, Any]) -> dict[str, Any]:
         out: dict[str, Any] = {}
@@ -152,8 +210,8 @@ class _ConfigProxy:
     def __setattr__(self, name: str, value: Any) -> None:
         globals()[name] = value
 
-    def reload_config(self) -> None:
-        reload_config()
+    def reload_config(self, force: bool = False) -> None:
+        reload_config(force)
 
     def _cfg_set(self, cfg: dict[str, Any], path: str, value: Any) -> None:
         _cfg_set(cfg, path, value)
@@ -398,16 +456,6 @@ def _make_checkable_combo(items: list[Any], selected: list[str]) -> tuple[QCombo
     return combo, model
 
 
-def _parse_list_entries(text: str) -> list[str]:
-    tokens = re.split(r"[,\n;]+", text.strip())
-    out: list[str] = []
-    for tok in tokens:
-        s = tok.strip()
-        if s:
-            out.append(s)
-    return out
-
-
 def _normalize_list(items: list[Any]) -> list[str]:
     out: list[str] = []
     for item in items:
@@ -533,18 +581,30 @@ def _ensure_decks(target_decks: set[str]) -> set[str]:
     return skipped
 
 
-def _deck_is_excluded(deck_name: str, exclude_decks: list[str]) -> bool:
-    for ex in exclude_decks:
-        if deck_name == ex or deck_name.startswith(ex):
-            return True
-    return False
+def _exclude_prefixes(exclude_decks: list[str]) -> tuple[str, ...]:
+    # Sorted and prefix-free: a prefix covered by a shorter one can never decide anything.
+    out: list[str] = []
+    for ex in sorted(set(exclude_decks)):
+        if out and ex.startswith(out[-1]):
+            continue
+        out.append(ex)
+    return tuple(out)
+
 
+def _deck_is_excluded(deck_name: str, prefixes: tuple[str, ...]) -> bool:
+    # In a sorted prefix-free tuple only the last entry <= deck_name can be a prefix of it.
+    i = bisect.bisect_right(prefixes, deck_name)
+    return bool(i) and deck_name.startswith(prefixes[i - 1])
 
-def _note_has_excluded_tag(note, exclude_tags: set[str]) -> bool:
+
+def _note_has_excluded_tag(note, exclude_tags: frozenset[str]) -> bool:
     if not exclude_tags:
         return False
-    note_tags = set(note.tags)
-    return any(tag in note_tags for tag in exclude_tags)
+    tags = note.tags
+    # Tag lists are usually short; scanning them beats building a set per note.
+    if len(tags) > 16:
+        return not exclude_tags.isdisjoint(tags)
+    return any(tag in exclude_tags for tag in tags)
 
 
 def _get_deck_id(deck_name: str, deck_id_cache: dict[str, int], skipped_decks: set[str]) -> int | None:
@@ -560,34 +620,100 @@ def _get_deck_id(deck_name: str, deck_id_cache: dict[str, int], skipped_decks: s
     return deck_id
 
 
-def _apply_moves(col: Collection, cards_in_deck: dict[int, list[int]]) -> int:
+_MOVE_CHUNK = 500
+# Full batches share one statement text, so SQLite keeps reusing its prepared plan.
+_MOVE_SQL = "UPDATE cards SET did = ? WHERE id IN (" + ",".join("?" * _MOVE_CHUNK) + ")"
+
+
+def _apply_moves(col: Collection, cards_in_deck: dict[int, set[int]]) -> int:
     moved = 0
     for deck_id, card_ids in cards_in_deck.items():
         if not card_ids:
             continue
-        unique_ids = list(set(card_ids))
+        unique_ids = tuple(card_ids)
         moved += len(unique_ids)
-        col.db.execute(
-            f"UPDATE cards SET did = ? WHERE id IN ({','.join('?' * len(unique_ids))})",
-            deck_id,
-            *unique_ids,
-        )
+        for i in range(0, len(unique_ids), _MOVE_CHUNK):
+            chunk = unique_ids[i : i + _MOVE_CHUNK]
+            if len(chunk) == _MOVE_CHUNK:
+                sql = _MOVE_SQL
+            else:
+                sql = f"UPDATE cards SET did = ? WHERE id IN ({','.join('?' * len(chunk))})"
+            col.db.execute(sql, deck_id, *chunk)
     return moved
 
 
+_CARD_ROWS_CHUNK = 900
+
+
+def _target_deck_name(cfg: dict[str, Any], card_ord: int) -> str:
+    if cfg.get("mode", "by_template") == "all":
+        return str(cfg.get("default_deck", "")).strip()
+    by_template = cfg.get("by_template", {}) or {}
+    if not isinstance(by_template, dict):
+        return ""
+    return str(by_template.get(str(card_ord), "")).strip()
+
+
+@dataclass(frozen=True)
+class _NoteRow:
+    id: int
+    mid: int
+    tags: tuple[str, ...]
+
+
+def _note_rows(col: Collection, nids: list[int]) -> list[_NoteRow]:
+    # The sorter reads only id, mid and tags; skip loading fields into full Note objects.
+    out: list[_NoteRow] = []
+    ids = tuple(nids)
+    for i in range(0, len(ids), _CARD_ROWS_CHUNK):
+        chunk = ids[i : i + _CARD_ROWS_CHUNK]
+        rows = col.db.all(
+            f"SELECT id, mid, tags FROM notes WHERE id IN ({','.join('?' * len(chunk))})",
+            *chunk,
+        )
+        for nid, mid, tags in rows:
+            out.append(_NoteRow(nid, mid, tuple((tags or "").split())))
+    return out
+
+
+def _card_rows_by_note(col: Collection, nids: list[int]) -> dict[int, list[tuple[int, int, int]]]:
+    # Only (id, ord, did) is needed per card, so read the raw rows instead of building Card objects.
+    out: dict[int, list[tuple[int, int, int]]] = {}
+    ids = tuple(dict.fromkeys(int(nid) for nid in nids))
+    for i in range(0, len(ids), _CARD_ROWS_CHUNK):
+        chunk = ids[i : i + _CARD_ROWS_CHUNK]
+        rows = col.db.all(
+            f"SELECT nid, id, ord, did FROM cards WHERE nid IN ({','.join('?' * len(chunk))})",
+            *chunk,
+        )
+        for nid, cid, ord_, did in rows:
+            out.setdefault(nid, []).append((cid, ord_, did))
+    return out
+
+
 def _sort_notes(notes: list, note_type_cfgs: dict[str, dict[str, Any]], skipped_decks: set[str]) -> dict[str, int]:
-    exclude_decks = _normalize_list(config.CARD_SORTER_EXCLUDE_DECKS)
-    exclude_tags = set(_normalize_list(config.CARD_SORTER_EXCLUDE_TAGS))
+    exclude_prefixes = _exclude_prefixes(_normalize_list(config.CARD_SORTER_EXCLUDE_DECKS))
+    exclude_tags = frozenset(_normalize_list(config.CARD_SORTER_EXCLUDE_TAGS))
     deck_id_cache: dict[str, int] = {}
-    cards_in_deck: dict[int, list[int]] = {}
+    excluded_by_did: dict[int, bool] = {}
+    model_cache: dict[int, Any] = {}
+    target_by_key: dict[tuple[int, int], int | None] = {}
+    cards_in_deck: dict[int, set[int]] = {}
+    col = mw.col
+    cards_by_nid = _card_rows_by_note(col, [note.id for note in notes])
 
     notes_processed = 0
     cards_moved = 0
 
     for note in notes:
-        model = mw.col.models.get(note.mid)
+        # Notes share a handful of note types and cards a handful of decks; resolve each id once per run.
+        mid = note.mid
+        if mid in model_cache:
+            model = model_cache[mid]
+        else:
+            model = model_cache[mid] = col.models.get(mid)
         nt_name = str(model.get("name", "")) if model else ""
-        nt_id = str(note.mid)
+        nt_id = str(mid)
         cfg = note_type_cfgs.get(nt_id)
         if not cfg:
             continue
@@ -598,34 +724,28 @@ def _sort_notes(notes: list, note_type_cfgs: dict[str, dict[str, Any]], skipped_
             continue
 
         notes_processed += 1
-        mode = cfg.get("mode", "by_template")
-        default_deck = str(cfg.get("default_deck", "")).strip()
-        by_template = cfg.get("by_template", {}) or {}
-        if not isinstance(by_template, dict):
-            by_template = {}
-
-        for card in note.cards():
-            card_deck_name = mw.col.decks.name(card.did)
-            if _deck_is_excluded(card_deck_name, exclude_decks):
+        for cid, card_ord, did in cards_by_nid.get(note.id, ()):
+            excluded = excluded_by_did.get(did)
+            if excluded is None:
+                excluded = excluded_by_did[did] = _deck_is_excluded(col.decks.name(did), exclude_prefixes)
+            if excluded:
                 continue
 
-            if mode == "all":
-                target_deck = default_deck
+            # The target only depends on (note type, template); resolve each pair once per run.
+            key = (mid, card_ord)
+            if key in target_by_key:
+                deck_id = target_by_key[key]
             else:
-                tmpl_ord = str(card.ord)
-                target_deck = str(by_template.get(tmpl_ord, "")).strip()
-
-            if not target_deck:
-                continue
-
-            deck_id = _get_deck_id(target_deck, deck_id_cache, skipped_decks)
+                target_deck = _target_deck_name(cfg, card_ord)
+                deck_id = _get_deck_id(target_deck, deck_id_cache, skipped_decks) if target_deck else None
+                target_by_key[key] = deck_id
             if deck_id is None:
                 continue
 
-            if card.did != deck_id:
-                cards_in_deck.setdefault(deck_id, []).append(card.id)
+            if did != deck_id:
+                cards_in_deck.setdefault(deck_id, set()).add(cid)
 
-    cards_moved = _apply_moves(mw.col, cards_in_deck)
+    cards_moved = _apply_moves(col, cards_in_deck)
     if config.DEBUG:
         dbg(
             "card_sorter: done",
@@ -679,7 +799,7 @@ def sort_all(*, reason: str = "manual") -> dict[str, int]:
     skipped_decks = _ensure_decks(_gather_target_decks(note_type_cfgs))
     note_types = list(note_type_cfgs.keys())
     note_ids = note_ids_for_note_types(mw.col, note_types)
-    notes = [mw.col.get_note(nid) for nid in note_ids]
+    notes = _note_rows(mw.col, note_ids)
     return _sort_notes(notes, note_type_cfgs, skipped_decks)
 
 
@@ -692,7 +812,7 @@ def _notify_error(msg: str, *, reason: str = "manual") -> None:
 
 
 def run_card_sorter(*, reason: str = "manual") -> None:
-    config.reload_config()
+    config.reload_config(force=True)
     dbg(
         "reloaded config",
         "debug=",
@@ -67,6 +67,8 @@ class ProviderContext:
 
 ProviderFn = Callable[[ProviderContext], list[LinkPayload]]
 _PROVIDERS: dict[str, tuple[int, ProviderFn]] = {}
+# (id, order, fn) sorted by (order, id); rebuilt on first use after register_provider.
+_SORTED_PROVIDERS: list[tuple[str, int, ProviderFn]] | None = None
 
 
 def _load_config() -> dict[str, Any]:
@@ -120,18 +122,23 @@ def _reload_config() -> None:
 
 
 def register_provider(provider_id: str, provider: ProviderFn, *, order: int = 100) -> None:
+    global _SORTED_PROVIDERS
     if not provider_id or not callable(provider):
         return
     _PROVIDERS[str(provider_id)] = (int(order), provider)
+    _SORTED_PROVIDERS = None
 
 
 def _iter_providers() -> list[tuple[str, int, ProviderFn]]:
-    items: list[tuple[str, int, ProviderFn]] = []
-    for provider_id, payload in _PROVIDERS.items():
-        prio, fn = payload
-        items.append((provider_id, prio, fn))
-    items.sort(key=lambda x: (x[1], x[0]))
-    return items
+    global _SORTED_PROVIDERS
+    if _SORTED_PROVIDERS is None or len(_SORTED_PROVIDERS) != len(_PROVIDERS):
+        items: list[tuple[str, int, ProviderFn]] = []
+        for provider_id, payload in _PROVIDERS.items():
+            prio, fn = payload
+            items.append((provider_id, prio, fn))
+        items.sort(key=lambda x: (x[1], x[0]))
+        _SORTED_PROVIDERS = items
+    return list(_SORTED_PROVIDERS)
 
 
 def _label_to_raw(label: str) -> str:
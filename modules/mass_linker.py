@@ -629,6 +629,10 @@ def _install_mass_linker_ui_hooks() -> None:
     _dbg("installed mass linker ui hooks")
 
 
+# Front/back side rules make the output depend on ctx.kind; browser_graph re-runs it per side.
+_mass_link_provider.kind_dependent = True  # type: ignore[attr-defined]
+
+
 def _build_settings(ctx):
     mass_linker_tab = QWidget()
     mass_linker_layout = QVBoxLayout()
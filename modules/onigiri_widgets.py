@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import html
+import json
 import time
 from typing import Iterable
 
 from aqt import gui_hooks, mw
 
+from .. import logging as core_logging
 from . import ModuleSpec
 
 
@@ -23,31 +25,36 @@ class GateProgress:
     free: int
 
 
-def _chunks(items: Iterable[int], size: int = 400) -> Iterable[list[int]]:
-    buf: list[int] = []
-    for x in items:
-        buf.append(int(x))
-        if len(buf) >= size:
-            yield buf
-            buf = []
-    if buf:
-        yield buf
+def _chunks(items: Iterable[int], size: int = 400) -> Iterable[tuple[int, ...]]:
+    arr = tuple(items)
+    for i in range(0, len(arr), size):
+        yield arr[i : i + size]
 
 
 def _count_unsuspended_cards(cids: set[int]) -> int:
     if not cids or mw is None or not getattr(mw, "col", None):
         return 0
+    # One round-trip: SQLite expands the id list itself and only the count comes back.
+    try:
+        total = mw.col.db.scalar(
+            "select count() from cards where queue != -1 and id in (select value from json_each(?))",
+            json.dumps(list(cids)),
+        )
+        return int(total or 0)
+    except Exception:
+        pass
     total = 0
-    for chunk in _chunks(cids, 400):
-        qmarks = ",".join(["?"] * len(chunk))
-        try:
-            rows = mw.col.db.all(
-                f"select queue from cards where id in ({qmarks})",
+    try:
+        for chunk in _chunks(cids, 400):
+            qmarks = ",".join(["?"] * len(chunk))
+            total += mw.col.db.scalar(
+                f"select count() from cards where queue != -1 and id in ({qmarks})",
                 *chunk,
-            )
-        except Exception:
-            continue
-        total += sum(1 for (q,) in rows if int(q) != -1)
+            ) or 0
+    except Exception as exc:
+        # A failing chunk would fail them all; report it once instead of under-counting quietly.
+        core_logging.warn("unsuspended card count failed:", repr(exc), source="onigiri_widgets")
+        return 0
     return int(total)
 
 
@@ -8,6 +8,8 @@ from typing import Any
 from aqt import mw
 from aqt.qt import QComboBox, QStandardItem, QStandardItemModel, Qt
 
+_LIST_SPLIT_RE = re.compile(r"[,\n;]+")
+
 
 @dataclass
 class SettingsContext:
@@ -41,13 +43,7 @@ def _parse_watch_nids(text: str) -> tuple[list[int], list[str]]:
 
 
 def _parse_list_entries(text: str) -> list[str]:
-    tokens = re.split(r"[,\n;]+", text.strip())
-    out: list[str] = []
-    for tok in tokens:
-        s = tok.strip()
-        if s:
-            out.append(s)
-    return out
+    return [s for s in (tok.strip() for tok in _LIST_SPLIT_RE.split(text.strip())) if s]
 
 
 def _get_deck_names() -> list[str]: